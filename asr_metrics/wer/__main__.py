@@ -2,16 +2,20 @@
 Simple script to run WER analysis using Whisper normalisers
 Prints results to terminal
 """
-import difflib
+import functools
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any, Tuple, Optional
-from collections import Counter
+from typing import Any, Iterable, Iterator, Sequence, Tuple, Optional
+from collections import Counter, deque
 import argparse
 import pandas as pd
 import re
 
 from jiwer import compute_measures, cer
+from rapidfuzz.distance import Levenshtein
 from asr_metrics.wer.normalizers import BasicTextNormalizer, EnglishTextNormalizer
 
 
@@ -56,18 +60,17 @@ def parse_sm_json(json_transcript: dict) -> str:
     return delimiter.join(words)
 
 
-def read_dbl(path: Path) -> list[str]:
+def read_dbl(path: Path) -> Iterator[str]:
     """
-    Returns a list of file path, given an input DBL file path
+    Yields each file path in turn, given an input DBL file path
     """
     with open(path, "r", encoding="utf-8") as input_path:
-        return input_path.readlines()
+        for line in input_path:
+            yield line.strip()
 
 
-class TranscriptDiff(difflib.SequenceMatcher):
-    def __init__(self, ref: list, hyp: list, join_token=" "):
-        super().__init__(None, ref, hyp)
-
+class TranscriptDiff:
+    def __init__(self, ref: Sequence[str], hyp: Sequence[str], join_token=" "):
         self.endcolour = "\x1b[0m"
         self.join_token = join_token
 
@@ -86,6 +89,26 @@ class TranscriptDiff(difflib.SequenceMatcher):
         self.hyp = hyp
         self.diff = self.join_token.join(self.process_diff())
 
+    def get_opcodes(self) -> Iterable:
+        """
+        Returns the edits turning the reference into the hypothesis, which
+        unpack as (opcode, ref_i, ref_j, hyp_i, hyp_j) in the style of difflib.
+
+        These come from a Levenshtein alignment, which is much faster than
+        difflib's matching on long transcripts and lines up with the edits
+        jiwer counts towards the error rate.
+        """
+        if isinstance(self.ref, str) and isinstance(self.hyp, str):
+            # Characters are compared directly on the strings.
+            return Levenshtein.opcodes(self.ref, self.hyp)
+
+        # Tokens are mapped to small ints first, which are cheaper to compare
+        # than strings. The opcodes index the token lists either way.
+        vocab: dict[str, int] = {}
+        ref_ids = [vocab.setdefault(token, len(vocab)) for token in self.ref]
+        hyp_ids = [vocab.setdefault(token, len(vocab)) for token in self.hyp]
+        return Levenshtein.opcodes(ref_ids, hyp_ids)
+
     def _colourise_segment(self, transcript_segment: str, colour) -> str:
         """
         Return a transcript with the ANSI escape codes attached either side
@@ -106,14 +129,16 @@ class TranscriptDiff(difflib.SequenceMatcher):
         """
 
         diff = []
+        # Slices of a string of characters are already the segments we want.
+        join = str if isinstance(self.ref, str) else self.join_token.join
         for opcode, ref_i, ref_j, hyp_i, hyp_j in self.get_opcodes():
-            ref_segment = self.join_token.join(self.ref[ref_i:ref_j])
-            hyp_segment = self.join_token.join(self.hyp[hyp_i:hyp_j])
-
+            # Only join the segments each opcode uses, as for CER these are
+            # joined from single characters.
             if opcode == "equal":
-                diff.append(ref_segment)
+                diff.append(join(self.ref[ref_i:ref_j]))
 
-            if opcode == "insert":
+            elif opcode == "insert":
+                hyp_segment = join(self.hyp[hyp_i:hyp_j])
                 diff.append(
                     self._colourise_segment(
                         hyp_segment, self.colour_mapping["INSERTION"]
@@ -121,7 +146,8 @@ class TranscriptDiff(difflib.SequenceMatcher):
                 )
                 self.errors["insertions"].append(hyp_segment)
 
-            if opcode == "delete":
+            elif opcode == "delete":
+                ref_segment = join(self.ref[ref_i:ref_j])
                 diff.append(
                     self._colourise_segment(
                         ref_segment, self.colour_mapping["DELETION"]
@@ -129,14 +155,16 @@ class TranscriptDiff(difflib.SequenceMatcher):
                 )
                 self.errors["deletions"].append(ref_segment)
 
-            if opcode == "replace":
+            elif opcode == "replace":
+                substitution = (
+                    f"{join(self.ref[ref_i:ref_j])} -> {join(self.hyp[hyp_i:hyp_j])}"
+                )
                 diff.append(
                     self._colourise_segment(
-                        f"{ref_segment} -> {hyp_segment}",
-                        self.colour_mapping["SUBSTITUTION"],
+                        substitution, self.colour_mapping["SUBSTITUTION"]
                     )
                 )
-                self.errors["substitutions"].append(f"{ref_segment} -> {hyp_segment}")
+                self.errors["substitutions"].append(substitution)
 
         return diff
 
@@ -193,47 +221,55 @@ def is_supported(file_name: str) -> bool:
     return file_name.endswith((".dbl", ".txt", ".json", ".json-v2"))
 
 
-def run_cer(ref: str, hyp: str) -> Tuple[TranscriptDiff, dict[str, Any]]:
+def run_cer(
+    ref: str, hyp: str, diff: bool = True
+) -> Tuple[Optional[TranscriptDiff], dict[str, Any]]:
     """
     Run CER for input reference and hypothesis transcripts
 
     Args:
         ref (str): reference transcript
         hyp (str): hypothesis transcript
+        diff (bool): whether to diff the transcripts as well as scoring them
 
     Returns:
-        differ (dict): instance of the TranscriptDiff class with the error dict populated
+        differ (dict): instance of the TranscriptDiff class with the error dict populated,
+            or None if diff is False
         stats (dict): a dictionary containing the CER and other stats
     """
-    differ = TranscriptDiff(list(ref), list(hyp), join_token="")
+    differ = TranscriptDiff(ref, hyp, join_token="") if diff else None
     stats = cer(ref, hyp, return_dict=True)
-    stats["reference length"] = len(list(ref))
+    stats["reference length"] = len(ref)
     stats["accuracy"] = 1 - stats["cer"]
     return differ, stats
 
 
-def run_wer(ref: str, hyp: str) -> Tuple[TranscriptDiff, dict[str, Any]]:
+def run_wer(
+    ref: str, hyp: str, diff: bool = True
+) -> Tuple[Optional[TranscriptDiff], dict[str, Any]]:
     """
     Run WER for a single input reference and hypothesis transcript
 
     Args:
         ref (str): reference transcript
         hyp (str): hypothesis transcript
+        diff (bool): whether to diff the transcripts as well as scoring them
 
     Returns:
-        differ (dict): instance of the TranscriptDiff class with the error dict populated
+        differ (dict): instance of the TranscriptDiff class with the error dict populated,
+            or None if diff is False
         stats (dict): a dictionary containing the WER and other stats
     """
-    differ = TranscriptDiff(ref.split(), hyp.split(), join_token=" ")
+    differ = TranscriptDiff(ref.split(), hyp.split(), join_token=" ") if diff else None
     stats = compute_measures(ref, hyp)
     stats["reference length"] = len(ref.split())
     stats["accuracy"] = 1 - stats["wer"]
     return differ, stats
 
 
-def check_paths(ref_path, hyp_path) -> Tuple[list[str], list[str]]:
+def check_paths(ref_path, hyp_path) -> Tuple[Iterable[str], Iterable[str]]:
     """
-    Returns lists of ref and hyp file paths given input paths
+    Returns iterables of ref and hyp file paths given input paths
 
     Raises:
         AssertionError: if input paths do not have valid extension
@@ -310,6 +346,106 @@ def get_wer_args(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
     return parser
 
 
+@functools.lru_cache(maxsize=None)
+def get_normaliser(non_en: bool, keep_disfluencies: bool) -> BasicTextNormalizer:
+    """
+    Returns the normaliser for the given options, created once per process
+    """
+    if non_en:
+        return BasicTextNormalizer()
+    return EnglishTextNormalizer(remove_disfluencies=not keep_disfluencies)
+
+
+def normalise(text: str, non_en: bool, keep_disfluencies: bool) -> str:
+    """
+    Returns the normalised text
+    """
+    return get_normaliser(non_en, keep_disfluencies)(text)
+
+
+def process_pair(
+    ref: str, hyp: str, args: argparse.Namespace
+) -> Optional[dict[str, Any]]:
+    """
+    Normalises and scores a single pair of reference and hypothesis files
+
+    Args:
+        ref (str): path to the reference transcript
+        hyp (str): path to the hypothesis transcript
+        args (argparse.Namespace): the parsed command line arguments
+
+    Returns:
+        the stats, or None if either transcript is empty after normalisation.
+        The normalised transcripts are added under "normalised reference" and
+        "normalised hypothesis" only if --show-normalised is set, and the
+        TranscriptDiff under "diff" only if --diff or --show-errors is set.
+    """
+    options = (args.non_en, args.keep_disfluencies)
+    norm_ref = normalise(load_file(ref.strip(), file_type="txt"), *options)
+    norm_hyp = normalise(
+        load_file(hyp.strip(), file_type=args.transcript_type), *options
+    )
+
+    if len(norm_ref) == 0 or len(norm_hyp) == 0:
+        return None
+
+    # The stats come from jiwer, so the diff is only needed to print it
+    diff = args.diff or args.show_errors
+    if args.cer is True:
+        differ, stats = run_cer(norm_ref, norm_hyp, diff=diff)
+    else:
+        if args.mixed_error_rate is True:
+            norm_ref = add_space_between_cjk(norm_ref)
+            norm_hyp = add_space_between_cjk(norm_hyp)
+        differ, stats = run_wer(norm_ref, norm_hyp, diff=diff)
+
+    stats["file name"] = hyp
+    if args.show_normalised is True:
+        stats["normalised reference"] = norm_ref
+        stats["normalised hypothesis"] = norm_hyp
+    if differ is not None:
+        stats["diff"] = differ
+    return stats
+
+
+def process_pairs(
+    pairs: Iterable[Tuple[str, str]],
+    args: argparse.Namespace,
+    max_pending: Optional[int] = None,
+) -> Iterator[Tuple[str, str, Optional[dict[str, Any]]]]:
+    """
+    Yields each pair of files in turn with the result of process_pair for it
+
+    Args:
+        pairs (Iterable): the reference and hypothesis file paths to score
+        args (argparse.Namespace): the parsed command line arguments
+        max_pending (int): the most pairs submitted to the worker processes
+            without their results having been yielded, four per CPU by default
+    """
+    pairs = iter(pairs)
+    first = list(islice(pairs, 2))
+    if len(first) < 2:
+        for ref, hyp in first:
+            yield ref, hyp, process_pair(ref, hyp, args)
+        return
+
+    # Each pair of files is independent, so score them in parallel. Pairs are
+    # only read from the DBL as earlier results are yielded, so memory does
+    # not grow with the number of pairs.
+    if max_pending is None:
+        max_pending = 4 * (os.cpu_count() or 1)
+    pending: deque = deque()
+    with ProcessPoolExecutor() as executor:
+        for ref, hyp in chain(first, pairs):
+            pending.append((ref, hyp, executor.submit(process_pair, ref, hyp, args)))
+            if len(pending) >= max_pending:
+                ref, hyp, future = pending.popleft()
+                yield ref, hyp, future.result()
+        while pending:
+            ref, hyp, future = pending.popleft()
+            yield ref, hyp, future.result()
+
+
 def main(args: Optional[argparse.Namespace] = None):
     """
     Calls argparse to make a command line utility
@@ -319,13 +455,6 @@ def main(args: Optional[argparse.Namespace] = None):
         parser = get_wer_args(argparse.ArgumentParser())
         args = parser.parse_args()
 
-    if args.non_en:
-        normaliser = BasicTextNormalizer()
-    elif args.keep_disfluencies:
-        normaliser = EnglishTextNormalizer(remove_disfluencies=False)
-    else:
-        normaliser = EnglishTextNormalizer(remove_disfluencies=True)
-
     ref_files, hyp_files = check_paths(args.ref_path, args.hyp_path)
     columns = [
         "file name",
@@ -336,47 +465,40 @@ def main(args: Optional[argparse.Namespace] = None):
         "insertions",
     ]
     columns[1] = "cer" if args.cer else columns[1]
-    results = None
-
-    for ref, hyp in zip(ref_files, hyp_files):
-        norm_ref = normaliser(load_file(ref.strip(), file_type="txt"))
-        norm_hyp = normaliser(load_file(hyp.strip(), file_type=args.transcript_type))
-
-        warning = (
-            f"Reference or Hypothesis file empty. Skipping...\nRef: {ref}Hyp: {hyp}"
-        )
-        if len(norm_ref) == 0 or len(norm_hyp) == 0:
-            print(warning)
+    rows = []
+
+    # Pairs are read from the DBL files as they are scored. Only the stats
+    # are kept for each pair once it has been reported.
+    for ref, hyp, stats in process_pairs(zip(ref_files, hyp_files), args):
+        if stats is None:
+            print(
+                f"Reference or Hypothesis file empty. Skipping...\nRef: {ref}\nHyp: {hyp}"
+            )
             continue
 
-        if args.cer is True:
-            differ, stats = run_cer(norm_ref, norm_hyp)
-        else:
-            if args.mixed_error_rate is True:
-                norm_ref = add_space_between_cjk(norm_ref)
-                norm_hyp = add_space_between_cjk(norm_hyp)
-            differ, stats = run_wer(norm_ref, norm_hyp)
-
-        stats["file name"] = hyp
-
         if args.show_normalised is True:
-            print("NORMALISED REFERENCE:", norm_ref, sep="\n\n", end="\n\n")
-            print("NORMALISED HYPOTHESIS:", norm_hyp, sep="\n\n", end="\n\n")
+            print(
+                "NORMALISED REFERENCE:",
+                stats["normalised reference"],
+                sep="\n\n",
+                end="\n\n",
+            )
+            print(
+                "NORMALISED HYPOTHESIS:",
+                stats["normalised hypothesis"],
+                sep="\n\n",
+                end="\n\n",
+            )
 
         if args.diff is True:
-            differ.print_colourised_diff()
+            stats["diff"].print_colourised_diff()
 
         if args.show_errors is True:
-            differ.print_errors_by_type()
+            stats["diff"].print_errors_by_type()
 
-        if results is None:
-            results = pd.DataFrame(stats, columns=columns, index=[0])
-            continue
+        rows.append({column: stats[column] for column in columns})
 
-        results = pd.concat(
-            [results, pd.DataFrame(stats, columns=columns, index=[0])],
-            ignore_index=True,
-        )
+    results = pd.DataFrame(rows, columns=columns)
 
     if args.mixed_error_rate is True:
         results.rename(columns={"wer": "mixed_error_rate"}, inplace=True)
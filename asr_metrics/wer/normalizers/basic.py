@@ -1,7 +1,36 @@
+import functools
 import re
 import unicodedata
 import regex
 
+_BRACKETED_RE = re.compile(r"[<\[][^>\]]*[>\]]")
+_PARENTHESISED_RE = re.compile(r"\(([^)]+?)\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+_GRAPHEME_RE = regex.compile(r"\X", re.UNICODE)
+
+
+class _CharTranslation(dict):
+    """
+    A str.translate table which maps each character through `replace`,
+    filled in lazily so each distinct character is only looked up once.
+    """
+
+    def __init__(self, replace):
+        super().__init__()
+        self._replace = replace
+
+    def __missing__(self, codepoint):
+        replacement = self._replace(chr(codepoint))
+        self[codepoint] = replacement
+        return replacement
+
+
+def _symbol_to_space(c: str) -> str:
+    return " " if unicodedata.category(c)[0] in "MSP" else c
+
+
+_SYMBOLS_TO_SPACES = _CharTranslation(_symbol_to_space)
+
 
 def remove_symbols(s: str):
     """
@@ -13,10 +42,7 @@ def remove_symbols(s: str):
     Returns:
         s (str): same string which has been modified inplace
     """
-    return "".join(
-        " " if unicodedata.category(c)[0] in "MSP" else c
-        for c in unicodedata.normalize("NFKC", s)
-    )
+    return unicodedata.normalize("NFKC", s).translate(_SYMBOLS_TO_SPACES)
 
 
 class BasicTextNormalizer:
@@ -43,24 +69,33 @@ class BasicTextNormalizer:
             "ł": "l",
             "Ł": "L",
         }
+        # translation tables for remove_symbols_and_diacritics, by `keep`
+        self._diacritics_tables = {}
 
     def remove_symbols_and_diacritics(self, s: str, keep=""):
         """
         Replace any other markers, symbols, and punctuations with a space,
         and drop any diacritics (category 'Mn' and some manual mappings)
         """
-        return "".join(
-            c
-            if c in keep
-            else self.additional_diacritics[c]
-            if c in self.additional_diacritics
-            else ""
-            if unicodedata.category(c) == "Mn"
-            else " "
-            if unicodedata.category(c)[0] in "MSP"
-            else c
-            for c in unicodedata.normalize("NFKD", s)
-        )
+        table = self._diacritics_tables.get(keep)
+        if table is None:
+            table = _CharTranslation(
+                functools.partial(self._replace_symbol_or_diacritic, keep)
+            )
+            self._diacritics_tables[keep] = table
+        return unicodedata.normalize("NFKD", s).translate(table)
+
+    def _replace_symbol_or_diacritic(self, keep: str, c: str) -> str:
+        if c in keep:
+            return c
+        if c in self.additional_diacritics:
+            return self.additional_diacritics[c]
+        category = unicodedata.category(c)
+        if category == "Mn":
+            return ""
+        if category[0] in "MSP":
+            return " "
+        return c
 
     def clean(self, s: str):
         "Return a string without symbols and optionally without diacritics, given input string"
@@ -80,15 +115,15 @@ class BasicTextNormalizer:
 
         s = s.lower()
 
-        s = re.sub(r"[<\[][^>\]]*[>\]]", "", s)
-        s = re.sub(r"\(([^)]+?)\)", "", s)
+        s = _BRACKETED_RE.sub("", s)
+        s = _PARENTHESISED_RE.sub("", s)
 
         s = self.clean(s).lower()
 
         # insert a single space between characters in a string
         if self.split_letters:
-            s = " ".join(regex.findall(r"\X", s, re.UNICODE))
+            s = " ".join(_GRAPHEME_RE.findall(s))
 
-        s = re.sub(r"\s+", " ", s)
+        s = _WHITESPACE_RE.sub(" ", s)
 
         return s
@@ -1,12 +1,49 @@
+import functools
 import yaml
 import os
 import re
 from fractions import Fraction
-from typing import Iterator, List, Match, Optional, Union, Tuple, Dict
+from typing import Iterator, List, Match, Optional, Pattern, Union, Tuple, Dict
 
 from more_itertools import windowed
 
-from .basic import BasicTextNormalizer
+from .basic import (
+    _BRACKETED_RE,
+    _PARENTHESISED_RE,
+    _WHITESPACE_RE,
+    BasicTextNormalizer,
+)
+
+try:
+    # The libyaml based loader is much faster, but is not always available.
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+_SPACE_BEFORE_APOSTROPHE_RE = re.compile(r"\s+'")
+_COMMA_BETWEEN_DIGITS_RE = re.compile(r"(\d),(\d)")
+_FULL_STOP_NOT_BEFORE_DIGIT_RE = re.compile(r"\.([^0-9]|$)")
+_PREFIX_SYMBOL_RE = re.compile(r"[.$¢€£]([^0-9])")
+_SUFFIX_PERCENT_RE = re.compile(r"([^0-9])%")
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_replacements(
+    replacements: Tuple[Tuple[str, str], ...]
+) -> Tuple[Tuple[Pattern, str], ...]:
+    """
+    Returns the (pattern, replacement) pairs for the given (replacement,
+    pattern) pairs, with each pattern compiled once per process
+    """
+    return tuple(
+        (re.compile(pattern), replacement) for replacement, pattern in replacements
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_alternation(patterns: Tuple[str, ...]) -> Pattern:
+    "Returns a pattern matching any of the given patterns, compiled once per process"
+    return re.compile("|".join(patterns))
 
 
 def postprocess(s: str):
@@ -471,12 +508,21 @@ class EnglishTextNormalizer(BasicTextNormalizer):
 
         config_path = os.path.join(os.path.dirname(__file__), "english.yaml")
         with open(config_path, "r", encoding="utf-8") as config_file:
-            config = yaml.safe_load(config_file)
+            config = yaml.load(config_file, Loader=SafeLoader)
 
         self.remove_disfluencies = remove_disfluencies
         self.replacers, self.disfluencies, self.spellings = self.parse_config(config)
         self.standardize_numbers = EnglishNumberNormalizer()
 
+        # the configured patterns are compiled once, not per call or instance
+        self._disfluencies_pattern = _compile_alternation(
+            tuple(self.disfluencies.values())
+        )
+        self._disfluency_replacers = _compile_replacements(
+            tuple(self.disfluencies.items())
+        )
+        self._replacers = _compile_replacements(tuple(self.replacers.items()))
+
     def parse_config(
         self, config: dict
     ) -> Tuple[Dict[str, str], Dict[str, str], Dict[str, str]]:
@@ -501,26 +547,26 @@ class EnglishTextNormalizer(BasicTextNormalizer):
         s = s.lower()
 
         # remove words between square / rounded brackets
-        s = re.sub(r"[<\[][^>\]]*[>\]]", "", s)
-        s = re.sub(r"\(([^)]+?)\)", "", s)
+        s = _BRACKETED_RE.sub("", s)
+        s = _PARENTHESISED_RE.sub("", s)
 
         # remove disfluencies or map to standards
         if self.remove_disfluencies:
-            s = re.sub("|".join(self.disfluencies.values()), "", s)
+            s = self._disfluencies_pattern.sub("", s)
         else:
-            for replacement, pattern in self.disfluencies.items():
-                s = re.sub(pattern, replacement, s)
+            for pattern, replacement in self._disfluency_replacers:
+                s = pattern.sub(replacement, s)
 
         # standardize when there's a space before an apostrophe
-        s = re.sub(r"\s+'", "'", s)
+        s = _SPACE_BEFORE_APOSTROPHE_RE.sub("'", s)
 
         # expand contractions using mapping
-        for replacement, pattern in self.replacers.items():
-            s = re.sub(pattern, replacement, s)
+        for pattern, replacement in self._replacers:
+            s = pattern.sub(replacement, s)
 
         # remove commas between digits and remove full stops not followed by digits
-        s = re.sub(r"(\d),(\d)", r"\1\2", s)
-        s = re.sub(r"\.([^0-9]|$)", r" \1", s)
+        s = _COMMA_BETWEEN_DIGITS_RE.sub(r"\1\2", s)
+        s = _FULL_STOP_NOT_BEFORE_DIGIT_RE.sub(r" \1", s)
 
         # keep some symbols for numerics
         s = self.remove_symbols_and_diacritics(s, keep=".%$¢€£")
@@ -530,10 +576,10 @@ class EnglishTextNormalizer(BasicTextNormalizer):
         s = " ".join(self.spellings.get(word, word) for word in s.split())
 
         # now remove prefix/suffix symbols that are not preceded/followed by numbers
-        s = re.sub(r"[.$¢€£]([^0-9])", r" \1", s)
-        s = re.sub(r"([^0-9])%", r"\1 ", s)
+        s = _PREFIX_SYMBOL_RE.sub(r" \1", s)
+        s = _SUFFIX_PERCENT_RE.sub(r"\1 ", s)
 
         # replace any successive whitespace characters with a space
-        s = re.sub(r"\s+", " ", s)
+        s = _WHITESPACE_RE.sub(" ", s)
 
         return s
@@ -15,7 +15,7 @@ from polling2 import poll
 from tenacity import retry, retry_if_exception_type, stop_after_attempt
 
 from speechmatics.exceptions import JobNotFoundException, TranscriptionError
-from speechmatics.helpers import get_version
+from speechmatics.helpers import get_version, json_dumps
 from speechmatics.models import BatchTranscriptionConfig, ConnectionSettings, UsageMode
 
 LOGGER = logging.getLogger(__name__)
@@ -222,7 +222,7 @@ class BatchClient:
             ) as file:
                 config_dict = json.load(file)
         elif isinstance(transcription_config, BatchTranscriptionConfig):
-            config_dict = json.loads(transcription_config.as_config())
+            config_dict = transcription_config.as_config_dict()
         elif isinstance(transcription_config, dict):
             config_dict = transcription_config
         else:
@@ -251,7 +251,7 @@ class BatchClient:
                 )
 
             # httpx seems to expect an un-nested json, throws a type error otherwise.
-            config_data = {"config": json.dumps(config_dict, ensure_ascii=False)}
+            config_data = {"config": json_dumps(config_dict)}
 
             if audio_data:
                 audio_file = {"data_file": audio_data}
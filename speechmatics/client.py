@@ -5,12 +5,17 @@ Based on http://asyncio.readthedocs.io/en/latest/producer_consumer.html
 """
 
 import asyncio
+import contextlib
 import copy
+import functools
+import hashlib
 import json
 import logging
 import os
-from typing import Any, Dict, Optional, Union
-from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+import re
+import sys
+import time
+from typing import Any, Dict, Optional, Tuple, Union
 
 import httpx
 import websockets
@@ -20,7 +25,13 @@ from speechmatics.exceptions import (
     ForceEndSession,
     TranscriptionError,
 )
-from speechmatics.helpers import get_version, json_utf8, read_in_chunks
+from speechmatics.helpers import (
+    BufferPool,
+    get_version,
+    json_loads,
+    json_utf8,
+    read_in_chunks,
+)
 from speechmatics.models import (
     AudioSettings,
     ClientMessageType,
@@ -37,6 +48,18 @@ LOGGER = logging.getLogger(__name__)
 # logger at INFO level specifically prevents this spam.
 logging.getLogger("websockets.protocol").setLevel(logging.INFO)
 
+# Exceptions raised by the consumer or producer which end a session cleanly.
+_SESSION_ENDING_EXCEPTIONS = (EndOfTranscriptException, ForceEndSession)
+
+# Matches the type of a server message, which the server sends first.
+_MESSAGE_TYPE_PREFIX = re.compile(rb'\{\s*"message"\s*:\s*"(\w+)"')
+
+# The EndOfStream message, formatted with the last sequence number.
+_END_OF_STREAM_TEMPLATE = b'{"message":"EndOfStream","last_seq_no":%d}'
+
+# Number of audio chunks read from the stream ahead of sending them.
+_AUDIO_READ_AHEAD_CHUNKS = 4
+
 
 class WebsocketClient:
     """
@@ -75,19 +98,36 @@ class WebsocketClient:
 
         self.event_handlers = {x: [] for x in ServerMessageType}
         self.middlewares = {x: [] for x in ClientMessageType}
+        # Immutable snapshots of the above which are used when dispatching
+        # messages. They are rebuilt whenever a handler or middleware is added.
+        self._event_handlers_snapshot = {}
+        self._middlewares_snapshot = {}
+        self._update_dispatch_snapshots()
+        # Encoded control messages along with the objects they were built
+        # from, see _encode_control_message.
+        self._control_message_cache = {}
+        # HTTP client for temporary token requests, shared by the sessions of
+        # a run_many call. Set to None outside of run_many.
+        self._mp_client = None
 
         self.seq_no = 0
         self.session_running = False
         self._language_pack_info = None
         self._transcription_config_needs_update = False
         self._session_needs_closing = False
+        # Cached at the start of each session to keep the per-message
+        # debug logging check out of the hot path.
+        self._debug_logging = LOGGER.isEnabledFor(logging.DEBUG)
 
         # The following asyncio fields are fully instantiated in
         # _init_synchronization_primitives
         self._recognition_started = asyncio.Event
-        # Semaphore used to ensure that we don't send too much audio data to
-        # the server too quickly and burst any buffers downstream.
-        self._buffer_semaphore = asyncio.BoundedSemaphore
+        # Count of audio chunks sent but not yet acknowledged by the server,
+        # used to ensure that we don't send too much audio data to the server
+        # too quickly and burst any buffers downstream. The event is cleared
+        # while the count is at message_buffer_size.
+        self._audio_chunks_in_flight = 0
+        self._buffer_space_available = asyncio.Event
 
     async def _init_synchronization_primitives(self):
         """
@@ -95,9 +135,9 @@ class WebsocketClient:
         an event loop
         """
         self._recognition_started = asyncio.Event()
-        self._buffer_semaphore = asyncio.BoundedSemaphore(
-            self.connection_settings.message_buffer_size
-        )
+        self._audio_chunks_in_flight = 0
+        self._buffer_space_available = asyncio.Event()
+        self._buffer_space_available.set()
 
     def _flag_recognition_started(self):
         """
@@ -127,7 +167,6 @@ class WebsocketClient:
         """
         return self._language_pack_info
 
-    @json_utf8
     def _set_recognition_config(self):
         """
         Constructs a
@@ -135,22 +174,16 @@ class WebsocketClient:
         message.
         """
         assert self.transcription_config is not None
-        msg = {
-            "message": ClientMessageType.SetRecognitionConfig,
-            "transcription_config": self.transcription_config.as_config(),
-        }
-        if self.transcription_config.translation_config is not None:
-            msg[
-                "translation_config"
-            ] = self.transcription_config.translation_config.asdict()
-        if self.transcription_config.audio_events_config is not None:
-            msg[
-                "audio_events_config"
-            ] = self.transcription_config.audio_events_config.asdict()
-        self._call_middleware(ClientMessageType.SetRecognitionConfig, msg, False)
-        return msg
+        return self._encode_control_message(
+            ClientMessageType.SetRecognitionConfig,
+            self._build_set_recognition_config,
+            self.transcription_config,
+        )
 
     @json_utf8
+    def _build_set_recognition_config(self):
+        return self._build_config_message(ClientMessageType.SetRecognitionConfig)
+
     def _start_recognition(self, audio_settings):
         """
         Constructs a
@@ -162,34 +195,96 @@ class WebsocketClient:
         :type audio_settings: speechmatics.models.AudioSettings
         """
         assert self.transcription_config is not None
-        msg = {
-            "message": ClientMessageType.StartRecognition,
-            "audio_format": audio_settings.asdict(),
-            "transcription_config": self.transcription_config.as_config(),
-        }
-        if self.transcription_config.translation_config is not None:
-            msg[
-                "translation_config"
-            ] = self.transcription_config.translation_config.asdict()
-        if self.transcription_config.audio_events_config is not None:
-            msg[
-                "audio_events_config"
-            ] = self.transcription_config.audio_events_config.asdict()
         self.session_running = True
-        self._call_middleware(ClientMessageType.StartRecognition, msg, False)
-        LOGGER.debug(msg)
+        msg = self._encode_control_message(
+            ClientMessageType.StartRecognition,
+            functools.partial(self._build_start_recognition, audio_settings),
+            self.transcription_config,
+            audio_settings,
+        )
+        if self._debug_logging:
+            LOGGER.debug("%s", msg.decode())
         return msg
 
     @json_utf8
+    def _build_start_recognition(self, audio_settings):
+        return self._build_config_message(
+            ClientMessageType.StartRecognition, audio_format=audio_settings.asdict()
+        )
+
+    def _build_config_message(self, message_type, **fields):
+        """
+        Builds a message carrying the transcription config, with any other
+        given fields placed before it, and passes it through the middlewares.
+        Shared by the StartRecognition and SetRecognitionConfig messages.
+
+        :param message_type: The type of the message being built.
+        :type message_type: speechmatics.models.ClientMessageType
+
+        :return: The message to be encoded.
+        :rtype: dict
+        """
+        config = self.transcription_config
+        msg = {
+            "message": message_type,
+            **fields,
+            "transcription_config": config.as_config(),
+        }
+        if config.translation_config is not None:
+            msg["translation_config"] = config.translation_config.asdict()
+        if config.audio_events_config is not None:
+            msg["audio_events_config"] = config.audio_events_config.asdict()
+        self._call_middleware(message_type, msg, False)
+        return msg
+
+    def _encode_control_message(self, message_type, build, *sources):
+        """
+        Returns the encoded message produced by `build`, reusing the previous
+        encoding of this message type while the objects it was built from
+        compare equal. Messages with middlewares attached are always rebuilt
+        as the middlewares may alter them.
+
+        :param message_type: The type of the message being encoded.
+        :type message_type: speechmatics.models.ClientMessageType
+
+        :param build: Builds, passes through middlewares and encodes the message.
+        :type build: Callable[[], bytes]
+
+        :param sources: The objects the message is built from.
+        """
+        cached = self._control_message_cache.get(message_type)
+        if (
+            cached is not None
+            and cached[0] == sources
+            and not self._middlewares_snapshot.get(message_type)
+        ):
+            return cached[1]
+        encoded = build()
+        # Keep a copy so that later changes to the sources are detected.
+        self._control_message_cache[message_type] = (copy.deepcopy(sources), encoded)
+        return encoded
+
     def _end_of_stream(self):
         """
         Constructs an
         :py:attr:`speechmatics.models.ClientMessageType.EndOfStream`
         message.
         """
+        if self._middlewares_snapshot.get(ClientMessageType.EndOfStream):
+            return self._build_end_of_stream()
+        # Without middlewares to alter it the message is fixed apart from
+        # the sequence number, so it is formatted without a JSON encoder.
+        msg = _END_OF_STREAM_TEMPLATE % self.seq_no
+        if self._debug_logging:
+            LOGGER.debug("%s", msg.decode())
+        return msg
+
+    @json_utf8
+    def _build_end_of_stream(self):
         msg = {"message": ClientMessageType.EndOfStream, "last_seq_no": self.seq_no}
         self._call_middleware(ClientMessageType.EndOfStream, msg, False)
-        LOGGER.debug(msg)
+        if self._debug_logging:
+            LOGGER.debug("%s", msg)
         return msg
 
     def _consumer(self, message):
@@ -197,7 +292,7 @@ class WebsocketClient:
         Consumes messages and acts on them.
 
         :param message: Message received from the server.
-        :type message: str
+        :type message: Union[str, bytes]
 
         :raises TranscriptionError: on an error message received from the
             server after the Session started.
@@ -205,57 +300,97 @@ class WebsocketClient:
         :raises ForceEndSession: If this was raised by the user's event
             handler.
         """
-        LOGGER.debug(message)
-        message = json.loads(message)
+        if self._debug_logging:
+            # Messages are received as UTF-8 bytes, but logged as JSON text.
+            LOGGER.debug(
+                "%s", message.decode() if isinstance(message, bytes) else message
+            )
+        if isinstance(message, bytes) and self._consume_unparsed(message):
+            return
+        message = json_loads(message)
         message_type = message["message"]
 
-        for handler in self.event_handlers[message_type]:
+        handlers = self._event_handlers_snapshot.get(message_type, ())
+        internal_handler = self._internal_handlers.get(message_type)
+        # Each handler gets its own copy of the message, but the parsed
+        # message itself is not used again after the last handler unless an
+        # internal handler needs it, so that handler can be given it directly.
+        owner = len(handlers) - 1 if internal_handler is None else -1
+        for index, handler in enumerate(handlers):
             try:
-                handler(copy.deepcopy(message))
+                handler(message if index == owner else copy.deepcopy(message))
             except ForceEndSession:
                 LOGGER.warning("Session was ended forcefully by an event handler")
                 raise
 
-        if message_type == ServerMessageType.RecognitionStarted:
-            self._flag_recognition_started()
-            if "language_pack_info" in message:
-                self._set_language_pack_info(message["language_pack_info"])
-        elif message_type == ServerMessageType.AudioAdded:
-            self._buffer_semaphore.release()
-        elif message_type == ServerMessageType.EndOfTranscript:
-            raise EndOfTranscriptException()
-        elif message_type == ServerMessageType.Warning:
-            LOGGER.warning(message["reason"])
-        elif message_type == ServerMessageType.Error:
-            raise TranscriptionError(message["reason"])
-
-    async def _producer(self, stream, audio_chunk_size):
-        """
-        Yields messages to send to the server.
-
-        :param stream: File-like object which an audio stream can be read from.
-        :type stream: io.IOBase
-
-        :param audio_chunk_size: Size of audio chunks to send.
-        :type audio_chunk_size: int
-        """
-        async for audio_chunk in read_in_chunks(stream, audio_chunk_size):
-            if self._session_needs_closing:
-                break
-
-            if self._transcription_config_needs_update:
-                yield self._set_recognition_config()
-                self._transcription_config_needs_update = False
-
-            await asyncio.wait_for(
-                self._buffer_semaphore.acquire(),
-                timeout=self.connection_settings.semaphore_timeout_seconds,
-            )
-            self.seq_no += 1
-            self._call_middleware(ClientMessageType.AddAudio, audio_chunk, True)
-            yield audio_chunk
-
-        yield self._end_of_stream()
+        if internal_handler is not None:
+            internal_handler(self, message)
+
+    def _consume_unparsed(self, message):
+        """
+        Handles a message from its type alone when nothing needs its body,
+        which is the case for AudioAdded acknowledgements without user event
+        handlers. This avoids parsing the most frequent message from the
+        server.
+
+        :param message: Raw message received from the server.
+        :type message: bytes
+
+        :return: Whether the message was handled.
+        :rtype: bool
+        """
+        match = _MESSAGE_TYPE_PREFIX.match(message)
+        if match is None:
+            return False
+        message_type = match.group(1).decode("ascii")
+        if self._event_handlers_snapshot.get(message_type):
+            return False
+        if message_type not in self._internal_handlers:
+            # Nothing handles this message.
+            return True
+        if message_type not in self._bodiless_message_types:
+            return False
+        self._internal_handlers[message_type](self, None)
+        return True
+
+    def _on_recognition_started(self, message):
+        """Marks the session as started and stores the language pack info."""
+        self._flag_recognition_started()
+        if "language_pack_info" in message:
+            self._set_language_pack_info(message["language_pack_info"])
+
+    def _on_audio_added(self, _message):
+        """Frees a slot in the audio buffer for the acknowledged chunk."""
+        if self._audio_chunks_in_flight <= 0:
+            raise ValueError("AudioAdded received without any audio in flight")
+        self._audio_chunks_in_flight -= 1
+        self._buffer_space_available.set()
+
+    def _on_end_of_transcript(self, _message):
+        """Ends the session once the server has sent the full transcript."""
+        raise EndOfTranscriptException()
+
+    def _on_warning(self, message):
+        """Logs a warning sent by the server."""
+        LOGGER.warning(message["reason"])
+
+    def _on_error(self, message):
+        """Ends the session with the error sent by the server."""
+        raise TranscriptionError(message["reason"])
+
+    # The client's own handling of server messages, looked up by message type
+    # in _consumer after the user's event handlers have been called.
+    _internal_handlers = {
+        ServerMessageType.RecognitionStarted: _on_recognition_started,
+        ServerMessageType.AudioAdded: _on_audio_added,
+        ServerMessageType.EndOfTranscript: _on_end_of_transcript,
+        ServerMessageType.Warning: _on_warning,
+        ServerMessageType.Error: _on_error,
+    }
+    # Message types whose internal handlers don't look at the message.
+    _bodiless_message_types = frozenset(
+        {ServerMessageType.AudioAdded, ServerMessageType.EndOfTranscript}
+    )
 
     async def _consumer_handler(self):
         """
@@ -263,9 +398,14 @@ class WebsocketClient:
 
         raises: ConnectionClosedError when the upstream closes unexpectedly
         """
+        # Bound once as these are looked up for every message.
+        recv = self.websocket.recv
+        consume = self._consumer
         while self.session_running:
             try:
-                message = await self.websocket.recv()
+                # Receive the raw UTF-8 bytes; the JSON parser decodes them
+                # itself, so decoding to str first would be wasted work.
+                message = await recv(decode=False)
             except websockets.exceptions.ConnectionClosedOK:
                 # Can occur if a timeout has closed the connection.
                 LOGGER.info("Cannot receive from closed websocket.")
@@ -273,23 +413,74 @@ class WebsocketClient:
             except websockets.exceptions.ConnectionClosedError as ex:
                 LOGGER.info("Disconnected while waiting for recv().")
                 raise ex
-            self._consumer(message)
+            consume(message)
 
     async def _producer_handler(self, stream, audio_chunk_size):
         """
         Controls the producer loop for sending messages to the server.
+        Sends the audio read from the stream, interleaved with any pending
+        config updates, followed by an EndOfStream message.
+
+        :param stream: File-like object which an audio stream can be read from.
+        :type stream: io.IOBase
+
+        :param audio_chunk_size: Size of audio chunks to send.
+        :type audio_chunk_size: int
         """
         await self._recognition_started.wait()
-        async for message in self._producer(stream, audio_chunk_size):
-            try:
-                await self.websocket.send(message)
-            except websockets.exceptions.ConnectionClosedOK:
-                # Can occur if a timeout has closed the connection.
-                LOGGER.info("Cannot send from a closed websocket.")
-                return
-            except websockets.exceptions.ConnectionClosedError:
-                LOGGER.info("Disconnected while sending a message().")
-                return
+        # Audio is read into a ring of reusable buffers rather than allocating
+        # a new bytes object per chunk. Client frames are masked, so send()
+        # copies the chunk and its buffer is free again once send() returns.
+        # The ring only needs to hold the chunks being read ahead in the
+        # background, the one being read into and the one being sent.
+        buffer_pool = BufferPool(_AUDIO_READ_AHEAD_CHUNKS + 2, audio_chunk_size)
+        # Bound once as these are looked up for every audio chunk.
+        send = self.websocket.send
+        # Control messages are encoded to UTF-8 up front, but must still go
+        # out as text frames.
+        send_text = functools.partial(send, text=True)
+        max_chunks_in_flight = self.connection_settings.message_buffer_size
+        buffer_space_available = self._buffer_space_available
+        semaphore_timeout = self.connection_settings.semaphore_timeout_seconds
+        call_middleware = self._call_middleware
+        add_audio = ClientMessageType.AddAudio
+        try:
+            async for audio_chunk in read_in_chunks(
+                stream,
+                audio_chunk_size,
+                buffer_pool=buffer_pool,
+                read_ahead=_AUDIO_READ_AHEAD_CHUNKS,
+            ):
+                if self._session_needs_closing:
+                    break
+
+                if self._transcription_config_needs_update:
+                    await send_text(self._set_recognition_config())
+                    self._transcription_config_needs_update = False
+
+                # Only wait when the buffer is full, so that sending into a
+                # buffer with free slots never suspends.
+                if self._audio_chunks_in_flight >= max_chunks_in_flight:
+                    await asyncio.wait_for(
+                        buffer_space_available.wait(), timeout=semaphore_timeout
+                    )
+                self._audio_chunks_in_flight += 1
+                if self._audio_chunks_in_flight >= max_chunks_in_flight:
+                    buffer_space_available.clear()
+                self.seq_no += 1
+                # Most sessions have no AddAudio middleware, so check for one
+                # here rather than calling into _call_middleware per chunk.
+                # Middlewares get their own bytes, as the buffer is reused.
+                if self._middlewares_snapshot.get(add_audio):
+                    call_middleware(add_audio, bytes(audio_chunk), True)
+                await send(audio_chunk)
+
+            await send_text(self._end_of_stream())
+        except websockets.exceptions.ConnectionClosedOK:
+            # Can occur if a timeout has closed the connection.
+            LOGGER.info("Cannot send from a closed websocket.")
+        except websockets.exceptions.ConnectionClosedError:
+            LOGGER.info("Disconnected while sending a message().")
 
     def _call_middleware(self, event_name, *args):
         """
@@ -297,13 +488,28 @@ class WebsocketClient:
 
         :raises ForceEndSession: If this was raised by the user's middleware.
         """
-        for middleware in self.middlewares[event_name]:
+        middlewares = self._middlewares_snapshot.get(event_name)
+        if not middlewares:
+            return
+        for middleware in middlewares:
             try:
                 middleware(*args)
             except ForceEndSession:
                 LOGGER.warning("Session was ended forcefully by a middleware")
                 raise
 
+    def _update_dispatch_snapshots(self):
+        """
+        Rebuilds the tuples of event handlers and middlewares used for
+        dispatch from the `event_handlers` and `middlewares` lists.
+        """
+        self._event_handlers_snapshot = {
+            name: tuple(handlers) for name, handlers in self.event_handlers.items()
+        }
+        self._middlewares_snapshot = {
+            name: tuple(middlewares) for name, middlewares in self.middlewares.items()
+        }
+
     def update_transcription_config(self, new_transcription_config):
         """
         Updates the transcription config used for the session.
@@ -312,16 +518,26 @@ class WebsocketClient:
         :param new_transcription_config: The new config object.
         :type new_transcription_config: speechmatics.models.TranscriptionConfig
         """
+        # Callers often pass the current config back unchanged, which can be
+        # detected without comparing it field by field.
+        if new_transcription_config is self.transcription_config:
+            return
         if new_transcription_config != self.transcription_config:
             self.transcription_config = new_transcription_config
             self._transcription_config_needs_update = True
+            # The config is known to have changed, so skip comparing it
+            # against the cached message when the update is sent.
+            self._control_message_cache.pop(
+                ClientMessageType.SetRecognitionConfig, None
+            )
 
     def add_event_handler(self, event_name, event_handler):
         """
         Add an event handler (callback function) to handle an incoming
-        message from the server. Event handlers are passed a copy of the
-        incoming message from the server. If `event_name` is set to 'all' then
-        the handler will be added for every event.
+        message from the server. Each event handler is passed its own copy of
+        the incoming message from the server, so may modify it freely. If
+        `event_name` is set to 'all' then the handler will be added for every
+        event.
 
         For example, a simple handler that just prints out the
         :py:attr:`speechmatics.models.ServerMessageType.AddTranscript`
@@ -354,6 +570,7 @@ class WebsocketClient:
             )
         else:
             self.event_handlers[event_name].append(event_handler)
+        self._update_dispatch_snapshots()
 
     def add_middleware(self, event_name, middleware):
         """
@@ -389,6 +606,7 @@ class WebsocketClient:
             )
         else:
             self.middlewares[event_name].append(middleware)
+        self._update_dispatch_snapshots()
 
     async def _communicate(self, stream, audio_settings):
         """
@@ -400,7 +618,11 @@ class WebsocketClient:
             start_recognition_msg = self._start_recognition(audio_settings)
         except ForceEndSession:
             return
-        await self.websocket.send(start_recognition_msg)
+        await self.websocket.send(start_recognition_msg, text=True)
+
+        if sys.version_info >= (3, 11):
+            await self._run_tasks_in_group(stream, audio_settings)
+            return
 
         consumer_task = asyncio.create_task(self._consumer_handler())
         producer_task = asyncio.create_task(
@@ -416,9 +638,33 @@ class WebsocketClient:
 
         for task in done:
             exc = task.exception()
-            if exc and not isinstance(exc, (EndOfTranscriptException, ForceEndSession)):
+            if exc and not isinstance(exc, _SESSION_ENDING_EXCEPTIONS):
                 raise exc
 
+    async def _run_tasks_in_group(self, stream, audio_settings):
+        """
+        Runs the consumer and producer in an :py:class:`asyncio.TaskGroup`,
+        which cancels the other task as soon as one fails.
+        Only used on Python 3.11+, where task groups are available.
+
+        :raises BaseException: The first exception raised by either task,
+            other than the exceptions which end the session normally. Any
+            further exceptions are logged.
+        """
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                task_group.create_task(self._consumer_handler())
+                task_group.create_task(
+                    self._producer_handler(stream, audio_settings.chunk_size)
+                )
+        except BaseExceptionGroup as exc_group:  # noqa: F821 pylint: disable=undefined-variable
+            _, errors = exc_group.split(_SESSION_ENDING_EXCEPTIONS)
+            if errors is not None:
+                first, *others = errors.exceptions
+                for other in others:
+                    LOGGER.error("Session also failed with %r", other, exc_info=other)
+                raise first  # pylint: disable=raise-missing-from
+
     async def run(
         self,
         stream,
@@ -451,6 +697,10 @@ class WebsocketClient:
         self.transcription_config = transcription_config
         self.seq_no = 0
         self._language_pack_info = None
+        # Pick up handlers and middlewares appended to the public lists
+        # directly rather than through add_event_handler/add_middleware.
+        self._update_dispatch_snapshots()
+        self._debug_logging = LOGGER.isEnabledFor(logging.DEBUG)
         await self._init_synchronization_primitives()
         if extra_headers is None:
             extra_headers = {}
@@ -467,30 +717,18 @@ class WebsocketClient:
             self.connection_settings.generate_temp_token
             and self.connection_settings.auth_token is not None
         ):
-            temp_token = await _get_temp_token(self.connection_settings.auth_token)
+            temp_token = await _get_temp_token(
+                self.connection_settings.auth_token, self._mp_client
+            )
             token = f"Bearer {temp_token}"
             extra_headers["Authorization"] = token
 
-        url = self.connection_settings.url
-
         # Extend connection url with sdk version information
         cli = "-cli" if from_cli is True else ""
-        version = get_version()
-        parsed_url = urlparse(url)
-
-        query_params = dict(parse_qsl(parsed_url.query))
-        query_params["sm-sdk"] = f"python{cli}-{version}"
-        updated_query = urlencode(query_params)
-
-        url_path = parsed_url.path
-        if not url_path.endswith(self.transcription_config.language.strip()):
-            if url_path.endswith("/"):
-                url_path += self.transcription_config.language.strip()
-            else:
-                url_path += f"/{self.transcription_config.language.strip()}"
-
-        updated_url = urlunparse(
-            parsed_url._replace(path=url_path, query=updated_query)
+        updated_url = _build_connection_url(
+            self.connection_settings.url,
+            self.transcription_config.language.strip(),
+            f"sm-sdk=python{cli}-{get_version()}",
         )
 
         try:
@@ -500,6 +738,10 @@ class WebsocketClient:
                 ping_timeout=self.connection_settings.ping_timeout_seconds,
                 # Don't limit the max. size of incoming messages
                 max_size=None,
+                # Don't stop reading from the server while messages are
+                # waiting to be consumed.
+                max_queue=None,
+                write_limit=self.connection_settings.write_buffer_size,
                 additional_headers=extra_headers,
             ) as self.websocket:
                 await self._communicate(stream, audio_settings)
@@ -517,6 +759,53 @@ class WebsocketClient:
         """
         self._session_needs_closing = True
 
+    async def run_many(
+        self,
+        streams,
+        transcription_config: TranscriptionConfig,
+        audio_settings: AudioSettings = None,
+        from_cli: bool = False,
+        extra_headers: Dict = None,
+    ):
+        """
+        Run a recognition session for each of the given streams in turn.
+        Running the sessions from one coroutine shares the event loop, and
+        with it any temporary token and HTTP connection used to fetch it,
+        rather than setting these up again for each
+        :py:meth:`run_synchronously` call.
+
+        >>> asyncio.run(client.run_many(streams, transcription_config))
+
+        :param streams: File-like objects which audio streams can be read from.
+        :type streams: Iterable[io.IOBase]
+
+        :param transcription_config: Configuration for the transcriptions.
+        :type transcription_config: speechmatics.models.TranscriptionConfig
+
+        :param audio_settings: Configuration for the audio streams.
+        :type audio_settings: speechmatics.models.AudioSettings
+
+        :param from_cli: Indicates whether the caller is the command-line interface or not.
+        :type from_cli: bool
+
+        :raises Exception: Can raise any exception returned by the
+            consumer/producer tasks, which stops any remaining sessions.
+        """
+        async with contextlib.AsyncExitStack() as stack:
+            if self.connection_settings.generate_temp_token:
+                self._mp_client = await stack.enter_async_context(_new_mp_client())
+                stack.callback(setattr, self, "_mp_client", None)
+            for stream in streams:
+                await self.run(
+                    stream,
+                    transcription_config,
+                    audio_settings,
+                    from_cli=from_cli,
+                    extra_headers=None
+                    if extra_headers is None
+                    else dict(extra_headers),
+                )
+
     def run_synchronously(self, *args, timeout=None, **kwargs):
         """
         Run the transcription synchronously.
@@ -550,19 +839,93 @@ class WebsocketClient:
             raise exc
 
 
-async def _get_temp_token(api_key):
+def _build_connection_url(url, language, sdk_param):
+    """
+    Appends the language to the path of the connection url, unless it is
+    already there, and sets the `sm-sdk` query parameter.
+
+    This is done with plain string operations as the url only ever needs
+    these two edits, which avoids parsing and re-encoding it per session.
+    """
+    base, _, query = url.partition("?")
+    if not base.endswith(language):
+        base += language if base.endswith("/") else f"/{language}"
+    params = [
+        param for param in query.split("&") if param and not param.startswith("sm-sdk=")
+    ]
+    params.append(sdk_param)
+    return f"{base}?{'&'.join(params)}"
+
+
+# Lifetime in seconds requested for temporary tokens.
+_TEMP_TOKEN_TTL = 60
+# Cached temporary tokens are not handed out this close to their expiry, so
+# that there is still time to connect with them.
+_TEMP_TOKEN_EXPIRY_MARGIN = 10
+
+# Most temporary tokens cached at once. The least recently used is dropped
+# to make room.
+_TEMP_TOKEN_CACHE_SIZE = 16
+
+# Temporary tokens by a digest of the API key they were requested with, so
+# the keys themselves are not kept, along with the time.monotonic() value
+# after which they should no longer be used.
+_temp_tokens: Dict[bytes, Tuple[str, float]] = {}
+
+
+def clear_temp_tokens():
+    """
+    Forgets the temporary tokens cached for reuse, so that the next session
+    requests a new one, e.g. after an API key has been revoked.
     """
-    Used to get a temporary token from management platform api for SaaS users
+    _temp_tokens.clear()
+
+
+def _new_mp_client() -> httpx.AsyncClient:
     """
+    Returns a new HTTP/2 client for the management platform. Callers close it
+    with ``async with`` once their sessions are done, as its pooled
+    connections belong to the event loop it is used on.
+    """
+    return httpx.AsyncClient(http2=True, limits=httpx.Limits(keepalive_expiry=300))
+
+
+async def _get_temp_token(api_key, http_client=None):
+    """
+    Used to get a temporary token from management platform api for SaaS users.
+    Tokens are reused for sessions started while they are still valid.
+    The request is made with `http_client` when given, and otherwise with a
+    client which is closed once the token has been fetched.
+    """
+    cache_key = hashlib.sha256(api_key.encode()).digest()
+    cached = _temp_tokens.pop(cache_key, None)
+    if cached is not None and time.monotonic() < cached[1]:
+        _temp_tokens[cache_key] = cached
+        return cached[0]
+
     version = get_version()
     mp_api_url = os.getenv("SM_MANAGEMENT_PLATFORM_URL", "https://mp.speechmatics.com")
     endpoint = mp_api_url + "/v1/api_keys"
     params = {"type": "rt", "sm-sdk": f"python-{version}"}
-    body = {"ttl": 60}
+    body = {"ttl": _TEMP_TOKEN_TTL}
     headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-    # pylint: disable=no-member
-    response = httpx.post(endpoint, json=body, params=params, headers=headers)
+    requested_at = time.monotonic()
+    async with contextlib.AsyncExitStack() as stack:
+        if http_client is None:
+            http_client = await stack.enter_async_context(_new_mp_client())
+        response = await http_client.post(
+            endpoint, json=body, params=params, headers=headers
+        )
     response.raise_for_status()
-    response.read()
     key_object = response.json()
+    # Expired tokens are dropped rather than kept until their key is reused.
+    now = time.monotonic()
+    for expired in [key for key, (_, expiry) in _temp_tokens.items() if expiry <= now]:
+        del _temp_tokens[expired]
+    while len(_temp_tokens) >= _TEMP_TOKEN_CACHE_SIZE:
+        del _temp_tokens[next(iter(_temp_tokens))]
+    _temp_tokens[cache_key] = (
+        key_object["key_value"],
+        requested_at + _TEMP_TOKEN_TTL - _TEMP_TOKEN_EXPIRY_MARGIN,
+    )
     return key_object["key_value"]
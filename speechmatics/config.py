@@ -1,19 +1,41 @@
+import sys
 from pathlib import Path
 
-import toml
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
 
 CONFIG_PATH = Path.home().resolve() / ".speechmatics/config"
 
+# The parsed config file, with the modification time and size it was read at.
+_config_cache = {}
+
+
+def _load_config_file():
+    try:
+        stat = CONFIG_PATH.stat()
+    except FileNotFoundError:
+        return None
+    key = (CONFIG_PATH, stat.st_mtime_ns, stat.st_size)
+    if _config_cache.get("key") != key:
+        with CONFIG_PATH.open("rb") as file:
+            _config_cache["config"] = tomllib.load(file)
+        _config_cache["key"] = key
+    return _config_cache["config"]
+
 
 def read_config_from_home(profile: str = "default"):
-    if CONFIG_PATH.exists():
-        cli_config = {"default": {}}
-        with CONFIG_PATH.open("r", encoding="UTF-8") as file:
-            cli_config = toml.load(file)
+    """
+    Reads a profile from the config file. The file is parsed once and only
+    read again when it has changed on disk.
+    """
+    cli_config = _load_config_file()
+    if cli_config is not None:
         if profile not in cli_config:
             raise SystemExit(
                 f"Cannot unset config for profile {profile}. Profile does not exist."
             )
-        return cli_config[profile]
+        return dict(cli_config[profile])
 
     return None
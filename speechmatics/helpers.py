@@ -4,13 +4,18 @@ Helper functions used by the library.
 """
 
 import asyncio
-import concurrent.futures
+import functools
 import importlib.metadata
 import inspect
 import json
 import os
 import sys
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 
 def del_none(dictionary):
     """
@@ -23,25 +28,104 @@ def del_none(dictionary):
     :return: output dictionary
     :rtype: dict
     """
-    for key, value in list(dictionary.items()):
-        if value is None:
-            del dictionary[key]
-        elif isinstance(value, dict):
-            del_none(value)
+    # Walk the nested dictionaries with an explicit stack rather than
+    # recursing, avoiding a function call per nested dictionary.
+    stack = [dictionary]
+    while stack:
+        current = stack.pop()
+        for key, value in list(current.items()):
+            if value is None:
+                del current[key]
+            elif isinstance(value, dict):
+                stack.append(value)
     return dictionary
 
 
+def json_loads(data):
+    """
+    Parses a JSON document, using orjson when it is installed as it is
+    considerably faster than the standard library on large documents.
+
+    :param data: the JSON document
+    :type data: Union[str, bytes]
+
+    :return: the parsed document
+    :rtype: Any
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj):
+    """
+    Encodes an object as a JSON document, leaving non-ASCII characters as they
+    are. orjson is used when it is installed as it is considerably faster than
+    the standard library.
+
+    :param obj: the object to encode
+    :type obj: Any
+
+    :return: the JSON document
+    :rtype: str
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False)
+
+
 def json_utf8(func):
-    """A decorator to turn a function's return value into JSON"""
+    """
+    A decorator to turn a function's return value into UTF-8 encoded JSON.
+    orjson is used when it is installed as it encodes straight to bytes.
+    """
 
     def wrapper(*args, **kwargs):
         """wrapper"""
-        return json.dumps(func(*args, **kwargs))
+        if orjson is not None:
+            return orjson.dumps(func(*args, **kwargs))
+        return json.dumps(func(*args, **kwargs)).encode("utf-8")
 
     return wrapper
 
 
-async def read_in_chunks(stream, chunk_size):
+class BufferPool:
+    """
+    A ring of reusable byte buffers, allocated lazily on first use.
+
+    A buffer returned by :py:meth:`next_buffer` is handed out again after
+    `num_buffers` further calls, so callers must be done with it by then.
+
+    :param num_buffers: number of buffers in the ring
+    :type num_buffers: int
+
+    :param buffer_size: size in bytes of each buffer
+    :type buffer_size: int
+    """
+
+    def __init__(self, num_buffers, buffer_size):
+        self.num_buffers = max(1, num_buffers)
+        self.buffer_size = buffer_size
+        self._buffers = []
+        self._index = 0
+
+    def next_buffer(self):
+        """
+        Returns the next buffer in the ring.
+
+        :return: a writable buffer of `buffer_size` bytes
+        :rtype: bytearray
+        """
+        if len(self._buffers) < self.num_buffers:
+            buffer = bytearray(self.buffer_size)
+            self._buffers.append(buffer)
+            return buffer
+        buffer = self._buffers[self._index]
+        self._index = (self._index + 1) % self.num_buffers
+        return buffer
+
+
+async def read_in_chunks(stream, chunk_size, buffer_pool=None, read_ahead=0):
     """
     Utility method for reading in and yielding chunks
 
@@ -51,6 +135,19 @@ async def read_in_chunks(stream, chunk_size):
     :param chunk_size: maximum chunk size in bytes
     :type chunk_size: int
 
+    :param buffer_pool: optional pool of pre-allocated buffers to read
+        synchronous streams into. When given, and the stream supports
+        `readinto`, chunks are yielded as :py:class:`memoryview` slices of the
+        pooled buffers instead of freshly allocated bytes.
+    :type buffer_pool: speechmatics.helpers.BufferPool
+
+    :param read_ahead: number of chunks to read ahead of the caller in a
+        background task when reading into `buffer_pool`, so that reading the
+        stream overlaps with processing the chunks already read. The pool
+        must hold at least `read_ahead + 2` buffers: those queued, the one
+        being read into and the one held by the caller.
+    :type read_ahead: int
+
     :raises ValueError: if no data was read from the stream
 
     :return: a sequence of chunks of data where the length in bytes of each
@@ -58,26 +155,99 @@ async def read_in_chunks(stream, chunk_size):
     :rtype: collections.AsyncIterable
 
     """
+    # Work with both async and synchronous file readers.
+    is_async = inspect.iscoroutinefunction(stream.read)
+    use_readinto = (
+        not is_async and buffer_pool is not None and hasattr(stream, "readinto")
+    )
+    if use_readinto and read_ahead > 0:
+        if buffer_pool.num_buffers < read_ahead + 2:
+            raise ValueError(f"buffer_pool must hold at least {read_ahead + 2} buffers")
+        async for audio_chunk in _read_ahead_in_chunks(
+            stream, chunk_size, buffer_pool, read_ahead
+        ):
+            yield audio_chunk
+        return
+
+    if not is_async:
+        _advise_sequential_read(stream)
+
+    # Synchronous reads are run on the loop's default executor to avoid
+    # blocking the event loop, rather than starting a new thread pool for
+    # every chunk.
+    loop = asyncio.get_running_loop()
     while True:
-        # Work with both async and synchronous file readers.
-        if inspect.iscoroutinefunction(stream.read):
+        if is_async:
             audio_chunk = await stream.read(chunk_size)
+        elif use_readinto:
+            buffer = memoryview(buffer_pool.next_buffer())[:chunk_size]
+            num_bytes = await loop.run_in_executor(None, stream.readinto, buffer)
+            audio_chunk = buffer[:num_bytes] if num_bytes else None
         else:
-            # Run the read() operation in a separate thread to avoid blocking the event loop.
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                audio_chunk = await asyncio.get_event_loop().run_in_executor(
-                    executor, stream.read, chunk_size
-                )
+            audio_chunk = await loop.run_in_executor(None, stream.read, chunk_size)
 
         if not audio_chunk:
             break
         yield audio_chunk
 
 
+def _advise_sequential_read(stream):
+    """
+    Tells the OS that a file-backed stream will be read sequentially, so that
+    it reads further ahead from disk. Does nothing for other streams or on
+    platforms without posix_fadvise.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(stream.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    except (AttributeError, OSError, ValueError):
+        # Not backed by a file descriptor, or not a regular file (e.g. a pipe).
+        pass
+
+
+async def _read_ahead_in_chunks(stream, chunk_size, buffer_pool, read_ahead):
+    """
+    Reads chunks from a synchronous stream into `buffer_pool` on the default
+    executor, up to `read_ahead` chunks ahead of the caller.
+    Any error raised while reading is re-raised to the caller in order.
+    """
+    _advise_sequential_read(stream)
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=read_ahead)
+
+    async def reader():
+        try:
+            while True:
+                buffer = memoryview(buffer_pool.next_buffer())[:chunk_size]
+                num_bytes = await loop.run_in_executor(None, stream.readinto, buffer)
+                if not num_bytes:
+                    break
+                await queue.put(buffer[:num_bytes])
+        except Exception as exc:  # pylint: disable=broad-except
+            await queue.put(exc)
+            return
+        await queue.put(None)
+
+    reader_task = asyncio.ensure_future(reader())
+    try:
+        while True:
+            audio_chunk = await queue.get()
+            if audio_chunk is None:
+                break
+            if isinstance(audio_chunk, Exception):
+                raise audio_chunk
+            yield audio_chunk
+    finally:
+        reader_task.cancel()
+
+
+@functools.lru_cache(maxsize=None)
 def get_version() -> str:
     """
     Reads the version number from the package or from VERSION file in case
     the package information is not found.
+    The result is cached as the version cannot change while running.
 
     :return: the library version
     :rtype: str
@@ -3,10 +3,11 @@
 Data models and message types used by the library.
 """
 
+import functools
 import json
 import ssl
 import sys
-from dataclasses import asdict, dataclass, field, fields
+from dataclasses import MISSING, Field, dataclass, fields
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
@@ -18,13 +19,62 @@ if sys.version_info >= (3, 8):
 else:
     from typing_extensions import Literal  # pragma: no cover
 
+if sys.version_info >= (3, 11):
+    from enum import StrEnum
+else:  # pragma: no cover
+
+    class StrEnum(str, Enum):
+        """Stand-in for :py:class:`enum.StrEnum` before Python 3.11."""
+
+        # Like enum.StrEnum, str() and format() give the member's value.
+        __str__ = str.__str__
+        __format__ = str.__format__
+
 
 SummaryContentType = Literal["informative", "conversational", "auto"]
 SummaryLength = Literal["brief", "detailed"]
 SummaryType = Literal["paragraphs", "bullets"]
 
+# Config models are created per request, so on Python 3.10+ they are slotted
+# to drop the per-instance __dict__.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@functools.lru_cache(maxsize=None)
+def _fields_by_name(cls) -> Dict[str, Field]:
+    """Returns the dataclass fields of `cls` by name, looked up once per class."""
+    return {f.name: f for f in fields(cls)}
+
+
+def _asdict(obj, exclude_none: bool = False, exclude=frozenset()) -> Dict[str, Any]:
+    """
+    Like :py:func:`dataclasses.asdict`, but without deep copying values which
+    are not containers, and optionally leaving out fields which are None or
+    named in `exclude`.
+    """
+    result = {}
+    for name in _fields_by_name(type(obj)):
+        if name in exclude:
+            continue
+        value = getattr(obj, name)
+        if value is None and exclude_none:
+            continue
+        result[name] = _asdict_value(value, exclude_none)
+    return result
+
+
+def _asdict_value(value, exclude_none: bool) -> Any:
+    """Converts a field value for :py:func:`_asdict`, copying containers."""
+    if hasattr(type(value), "__dataclass_fields__"):
+        return _asdict(value, exclude_none)
+    if isinstance(value, (list, tuple)):
+        return type(value)(_asdict_value(item, exclude_none) for item in value)
+    if isinstance(value, dict):
+        return {key: _asdict_value(item, exclude_none) for key, item in value.items()}
+    return value
+
+
+@dataclass(**_SLOTS)
 class FetchData:
     """Batch: Optional configuration for fetching file for transcription."""
 
@@ -39,7 +89,7 @@ class FetchData:
     """
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class NotificationConfig:
     """Batch: Optional configuration for callback notification."""
 
@@ -64,7 +114,7 @@ class NotificationConfig:
     """
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class SRTOverrides:
     """Batch: Optional configuration for SRT output."""
 
@@ -75,7 +125,7 @@ class SRTOverrides:
     """Sets maximum count of lines in a subtitle section"""
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class _TranscriptionConfig:  # pylint: disable=too-many-instance-attributes
     """Base model for defining transcription parameters."""
 
@@ -86,22 +136,26 @@ class _TranscriptionConfig:  # pylint: disable=too-many-instance-attributes
         which is useful for reusing code to build RT and batch configs.
         See cli.get_transcription_config() for an example.
         """
-        super().__init__()
+        # Slotted classes have no class-level defaults to fall back on, so
+        # every field is set here before applying the given values.
+        names = _fields_by_name(type(self))
+        for f in names.values():
+            if f.default is not MISSING:
+                setattr(self, f.name, f.default)
+            elif f.default_factory is not MISSING:
+                setattr(self, f.name, f.default_factory())
+
         # the language attribute is a special case, as it's a positional parameter
         if language is not None:
             self.language = language
 
-        # pylint: disable=consider-using-set-comprehension
-        names = set([f.name for f in fields(self)])
         for key, value in kwargs.items():
             if key in names:
                 setattr(self, key, value)
 
     def asdict(self) -> Dict[Any, Any]:
         """Returns model as a dict while excluding None values recursively."""
-        return asdict(
-            self, dict_factory=lambda x: {k: v for (k, v) in x if v is not None}
-        )
+        return _asdict(self, exclude_none=True)
 
     language: str = "en"
     """ISO 639-1 language code. eg. `en`"""
@@ -135,7 +189,7 @@ class _TranscriptionConfig:  # pylint: disable=too-many-instance-attributes
     """Configuration for applying filtering to the transcription."""
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class RTSpeakerDiarizationConfig:
     """Real-time mode: Speaker diarization config."""
 
@@ -143,7 +197,7 @@ class RTSpeakerDiarizationConfig:
     """This enforces the maximum number of speakers allowed in a single audio stream."""
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TranslationConfig:
     """Translation config."""
 
@@ -151,10 +205,10 @@ class TranslationConfig:
     """Target languages for which translation should be produced."""
 
     def asdict(self):
-        return asdict(self)
+        return _asdict(self)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class RTTranslationConfig(TranslationConfig):
     """Real-time mode: Translation config."""
 
@@ -163,7 +217,7 @@ class RTTranslationConfig(TranslationConfig):
     immediately, is enabled."""
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class BatchSpeakerDiarizationConfig:
     """Batch mode: Speaker diarization config."""
 
@@ -173,12 +227,12 @@ class BatchSpeakerDiarizationConfig:
     most sensitive."""
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class BatchTranslationConfig(TranslationConfig):
     """Batch mode: Translation config."""
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class BatchLanguageIdentificationConfig:
     """Batch mode: Language identification config."""
 
@@ -186,7 +240,7 @@ class BatchLanguageIdentificationConfig:
     """Expected languages for language identification"""
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class SummarizationConfig:
     """Defines summarization parameters."""
 
@@ -200,12 +254,12 @@ class SummarizationConfig:
     """Optional summarization summary_type parameter."""
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class SentimentAnalysisConfig:
     """Sentiment Analysis config."""
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TopicDetectionConfig:
     """Defines topic detection parameters."""
 
@@ -213,23 +267,21 @@ class TopicDetectionConfig:
     """Optional list of topics for topic detection."""
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AutoChaptersConfig:
     """Auto Chapters config."""
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AudioEventsConfig:
     types: Optional[List[str]] = None
     """Optional list of audio event types to detect."""
 
     def asdict(self):
-        if self.types is None:
-            return {}
-        return asdict(self)
+        return _asdict(self, exclude_none=True)
 
 
-@dataclass(init=False)
+@dataclass(init=False, **_SLOTS)
 class TranscriptionConfig(_TranscriptionConfig):
     # pylint: disable=too-many-instance-attributes
     """
@@ -289,7 +341,7 @@ class TranscriptionConfig(_TranscriptionConfig):
         return dictionary
 
 
-@dataclass(init=False)
+@dataclass(init=False, **_SLOTS)
 class BatchTranscriptionConfig(_TranscriptionConfig):
     # pylint: disable=too-many-instance-attributes
     """Batch: Defines transcription parameters for batch requests.
@@ -331,20 +383,30 @@ class BatchTranscriptionConfig(_TranscriptionConfig):
     audio_events_config: Optional[AudioEventsConfig] = None
 
     def as_config(self):
-        dictionary = self.asdict()
+        return json.dumps(self.as_config_dict())
 
-        fetch_data = dictionary.pop("fetch_data", None)
-        notification_config = dictionary.pop("notification_config", None)
-        language_identification_config = dictionary.pop(
-            "language_identification_config", None
-        )
-        translation_config = dictionary.pop("translation_config", None)
-        srt_overrides = dictionary.pop("srt_overrides", None)
-        summarization_config = dictionary.pop("summarization_config", None)
-        sentiment_analysis_config = dictionary.pop("sentiment_analysis_config", None)
-        topic_detection_config = dictionary.pop("topic_detection_config", None)
-        auto_chapters_config = dictionary.pop("auto_chapters_config", None)
-        audio_events_config = dictionary.pop("audio_events_config", None)
+    def as_config_dict(self) -> Dict[str, Any]:
+        """
+        Returns the config wrapped into a Speechmatics job config, as a dict
+        rather than the JSON string returned by :py:meth:`as_config`.
+        """
+        # The job level fields are converted straight from the attributes,
+        # rather than included in the transcription config and popped out.
+        dictionary = _asdict(self, exclude_none=True, exclude=_JOB_CONFIG_FIELDS)
+
+        def job_field(value):
+            return _asdict_value(value, exclude_none=True)
+
+        fetch_data = job_field(self.fetch_data)
+        notification_config = job_field(self.notification_config)
+        language_identification_config = job_field(self.language_identification_config)
+        translation_config = job_field(self.translation_config)
+        srt_overrides = job_field(self.srt_overrides)
+        summarization_config = job_field(self.summarization_config)
+        sentiment_analysis_config = job_field(self.sentiment_analysis_config)
+        topic_detection_config = job_field(self.topic_detection_config)
+        auto_chapters_config = job_field(self.auto_chapters_config)
+        audio_events_config = job_field(self.audio_events_config)
         config = {"type": "transcription", "transcription_config": dictionary}
 
         if fetch_data:
@@ -379,10 +441,28 @@ class BatchTranscriptionConfig(_TranscriptionConfig):
         if audio_events_config is not None:
             config["audio_events_config"] = audio_events_config
 
-        return json.dumps(config)
+        return config
 
 
-@dataclass
+# BatchTranscriptionConfig fields which go in the job config rather than in its
+# transcription_config.
+_JOB_CONFIG_FIELDS = frozenset(
+    {
+        "fetch_data",
+        "notification_config",
+        "language_identification_config",
+        "translation_config",
+        "srt_overrides",
+        "summarization_config",
+        "sentiment_analysis_config",
+        "topic_detection_config",
+        "auto_chapters_config",
+        "audio_events_config",
+    }
+)
+
+
+@dataclass(**_SLOTS)
 class AudioSettings:
     """Real-time: Defines audio parameters."""
 
@@ -407,7 +487,36 @@ class AudioSettings:
         }
 
 
-class UsageMode(str, Enum):
+class _LazySSLContext:
+    """
+    Descriptor for :py:attr:`ConnectionSettings.ssl_context` which creates the
+    default SSL context the first time it is read rather than up front, as
+    that loads the system CA certificates.
+
+    Read from the class, e.g. as the dataclass field default, it returns
+    itself, which stands for the default context when passed to `__init__`.
+    """
+
+    def __set_name__(self, owner, name):
+        self._attribute = f"_{name}"
+
+    def __repr__(self):
+        return "<default SSL context>"
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance.__dict__.get(self._attribute, self)
+        if value is self:
+            value = ssl.create_default_context()
+            instance.__dict__[self._attribute] = value
+        return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self._attribute] = value
+
+
+class UsageMode(StrEnum):
     # pylint: disable=invalid-name
     Batch = "batch"
     RealTime = "rt"
@@ -423,8 +532,9 @@ class ConnectionSettings:
     message_buffer_size: int = 512
     """Message buffer size in bytes."""
 
-    ssl_context: ssl.SSLContext = field(default_factory=ssl.create_default_context)
-    """SSL context."""
+    ssl_context: ssl.SSLContext = _LazySSLContext()
+    """SSL context. Defaults to :py:func:`ssl.create_default_context`, which is
+    only called if the context is used."""
 
     semaphore_timeout_seconds: float = 120
     """Semaphore timeout in seconds."""
@@ -439,6 +549,10 @@ class ConnectionSettings:
     """Automatically generate a temporary token for authentication.
     Enterprise customers should set this to False."""
 
+    write_buffer_size: int = 1 << 20
+    """Size in bytes of the outgoing websocket buffer above which sending
+    waits for it to drain."""
+
     def set_missing_values_from_config(self, mode: UsageMode):
         stored_config = read_config_from_home()
         if self.url is None or self.url == "":
@@ -490,7 +604,7 @@ class BatchConnectionSettings(ConnectionSettings):
     url = BATCH_SELF_SERVICE_URL
 
 
-class ClientMessageType(str, Enum):
+class ClientMessageType(StrEnum):
     # pylint: disable=invalid-name
     """Real-time: Defines various messages sent from client to server."""
 
@@ -511,7 +625,7 @@ class ClientMessageType(str, Enum):
     """Internal, Speechmatics only message. Allows the client to request the speakers data."""
 
 
-class ServerMessageType(str, Enum):
+class ServerMessageType(StrEnum):
     # pylint: disable=invalid-name
     """Real-time: Defines various message types sent from server to client."""
 
@@ -1,22 +1,32 @@
 import ssl
 import threading
 import asyncio
-import time
+import concurrent.futures
 import functools
 
 import websockets
 import pytest
 
+try:
+    import uvloop
+except ImportError:  # pragma: no cover
+    uvloop = None
+
+from speechmatics.client import clear_temp_tokens
+
 from .mock_rt_server import MockRealtimeLogbook, mock_server_handler
 from .utils import path_to_test_resource
 
 
+@functools.lru_cache(maxsize=None)
 def server_ssl_context():
     """
     Returns an SSL context for the mock RT server to use, with a self signed
-    certificate.
+    certificate. The certificate is only loaded once per test session.
     """
-    ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS)
+    ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    # Clients never resume sessions, so don't issue session tickets.
+    ssl_context.options |= ssl.OP_NO_TICKET
     ssl_context.load_cert_chain(
         path_to_test_resource("dummy_cert"),
         keyfile=path_to_test_resource("dummy_key"),
@@ -25,48 +35,96 @@ def server_ssl_context():
     return ssl_context
 
 
+@pytest.fixture(scope="session")
+def mock_server_session():
+    """
+    Fixture for running a single mock RT server for the whole test session.
+
+    The server runs on its own event loop in a background thread, and hands
+    each new connection to the handler of the logbook in
+    ``session["logbook"]`` at the time, so tests can share the server while
+    keeping separate logbooks.
+
+    Yields:
+        dict: The session state, holding the server's ``port`` and the
+        current ``logbook``.
+    """
+    session = {"logbook": None}
+
+    async def handler(websocket):
+        await mock_server_handler(websocket, logbook=session["logbook"])
+
+    # Resolved with the port once the server is listening.
+    server_ready = concurrent.futures.Future()
+
+    # Start extra event loop and start a mock server. uvloop is used when it
+    # is installed, as it is quicker at passing small messages.
+    event_loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+    server_stopping = event_loop.create_future()
+
+    async def server_thread():
+        async with websockets.serve(  # pylint: disable=no-member
+            handler,
+            host="127.0.0.1",
+            port=0,
+            ssl=server_ssl_context(),
+            # Messages are small and local, so skip compression, keepalive
+            # pings and the incoming size and queue limits.
+            compression=None,
+            ping_interval=None,
+            max_size=None,
+            max_queue=None,
+        ) as server:
+            server_ready.set_result(server.sockets[0].getsockname()[1])
+            await server_stopping
+
+    # The loop only runs the server, so it runs until the server is stopped.
+    loop_thread = threading.Thread(
+        target=event_loop.run_until_complete, args=(server_thread(),), daemon=True
+    )
+    loop_thread.start()
+    # Wait until the server is ready.
+    session["port"] = server_ready.result(timeout=5)
+
+    yield session
+
+    # Stop the server gracefully.
+    event_loop.call_soon_threadsafe(server_stopping.set_result, None)
+    # Don't let a connection that won't close stall the end of the session.
+    # The thread is a daemon, so it won't keep the process alive either.
+    loop_thread.join(timeout=5)
+    if not loop_thread.is_alive():
+        event_loop.close()
+
+
 @pytest.fixture()
-def mock_server(unused_tcp_port):
+def mock_server(mock_server_session):
     """
     Fixture for creating a mock RT server. The server is designed
     to behave very similarly to the actual RT server, but returns
     dummy responses to most messages.
 
-    The server runs in a background thread and is cleaned up as part of the
-    fixture's tear-down step.
+    The server itself is shared by the whole test session, see
+    :py:func:`mock_server_session`, but each test gets a new logbook.
 
     Yields:
         tests.mock_rt_server.MockRealtimeLogbook: An object used to record
         information about the messages received and sent by the mock server.
     """
-    port = unused_tcp_port
     logbook = MockRealtimeLogbook()
-    logbook.url = f"wss://127.0.0.1:{port}/v2"
-    mock_server_handler_with_logbook = functools.partial(
-        mock_server_handler, logbook=logbook
-    )
-
-    async def server_thread(handler):
-        try:
-            async with websockets.serve(  # pylint: disable=no-member
-                handler, host="127.0.0.1", port=port, ssl=server_ssl_context()
-            ) as logbook.server:
-                await asyncio.Future()
-        except asyncio.CancelledError:
-            asyncio.get_event_loop().stop()
-
-    # Start extra event loop and start a mock server
-    event_loop = asyncio.new_event_loop()
-    loop_thread = threading.Thread(target=event_loop.run_forever)
-    server_thread_future = asyncio.run_coroutine_threadsafe(
-        server_thread(mock_server_handler_with_logbook), event_loop
-    )
-    loop_thread.start()
-    # Wait until the thread is ready.
-    time.sleep(0.5)
+    logbook.url = f"wss://127.0.0.1:{mock_server_session['port']}/v2"
+    mock_server_session["logbook"] = logbook
 
     yield logbook
 
-    # Kill the server gracefully.
-    server_thread_future.cancel()
-    loop_thread.join()
+    mock_server_session["logbook"] = None
+
+
+@pytest.fixture(autouse=True)
+def no_cached_temp_tokens():
+    """
+    Fixture which clears the temporary tokens cached by the client after each
+    test, so that tests never reuse another test's token.
+    """
+    yield
+    clear_temp_tokens()
@@ -1,8 +1,29 @@
+import collections
+import itertools
 import json
 import logging
-import time
+import threading
 import websockets
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def json_dumps(obj):
+    """Encodes to UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def json_loads(data):
+    """Parses JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class MockRealtimeLogbook:
     """
@@ -18,6 +39,44 @@ class MockRealtimeLogbook:
         self.clients_disconnected_count = 0
         self.messages_received = []
         self.messages_sent = []
+        # The same messages, indexed as they are recorded.
+        self._received_by_type = collections.defaultdict(list)
+        self._sent_by_type = collections.defaultdict(list)
+        self._add_audio_received = []
+        self._disconnected = threading.Condition()
+
+    def record_received(self, msg):
+        """
+        Records a message received from the client.
+
+        Args:
+            msg (Union[dict, bytes]): The parsed message, or the raw bytes of
+                an `AddAudio` message.
+        """
+        self.messages_received.append(msg)
+        if isinstance(msg, dict):
+            self._received_by_type[msg.get("message")].append(msg)
+        else:
+            self._add_audio_received.append(msg)
+
+    def record_sent(self, msg):
+        """
+        Records a message sent to the client.
+
+        Args:
+            msg (dict): The message.
+        """
+        self.messages_sent.append(msg)
+        self._sent_by_type[msg.get("message")].append(msg)
+
+    def record_disconnect(self):
+        """
+        Records that a client has disconnected, waking up any callers of
+        `wait_for_clean_disconnects`.
+        """
+        with self._disconnected:
+            self.clients_disconnected_count += 1
+            self._disconnected.notify_all()
 
     def find_messages_by_type(self, msg_name):
         """
@@ -30,11 +89,7 @@ class MockRealtimeLogbook:
         Returns:
             List[dict]: The matching list of messages.
         """
-        return [
-            msg
-            for msg in self.messages_received
-            if isinstance(msg, dict) and msg["message"] == msg_name
-        ]
+        return list(self._received_by_type.get(msg_name, ()))
 
     def find_sent_messages_by_type(self, msg_name):
         """
@@ -46,11 +101,7 @@ class MockRealtimeLogbook:
         Returns:
             List[dict]: The matching list of messages.
         """
-        return [
-            msg
-            for msg in self.messages_sent
-            if isinstance(msg, dict) and msg["message"] == msg_name
-        ]
+        return list(self._sent_by_type.get(msg_name, ()))
 
     def find_add_audio_messages(self):
         """
@@ -59,7 +110,7 @@ class MockRealtimeLogbook:
         Returns:
             List[bytearray]: The matching list of messages.
         """
-        return [msg for msg in self.messages_received if not isinstance(msg, dict)]
+        return list(self._add_audio_received)
 
     def find_start_recognition_message(self):
         """
@@ -91,13 +142,10 @@ class MockRealtimeLogbook:
             TimeoutError: If we have been waiting longer than the given timeout
                 value.
         """
-        start = time.time()
-        while True:
-            if self.clients_disconnected_count >= num_disconnects:
-                return
-            if time.time() - start < timeout:
-                time.sleep(0.2)
-            else:
+        with self._disconnected:
+            if not self._disconnected.wait_for(
+                lambda: self.clients_disconnected_count >= num_disconnects, timeout
+            ):
                 raise TimeoutError("Timed out while waiting for client disconnects.")
 
 
@@ -153,8 +201,31 @@ def dummy_add_transcript():
     }
 
 
+# The transcripts sent for every AddAudio message, encoded once.
+ADD_PARTIAL_TRANSCRIPT = dummy_add_partial_transcript()
+ADD_PARTIAL_TRANSCRIPT_PAYLOAD = json_dumps(ADD_PARTIAL_TRANSCRIPT)
+ADD_TRANSCRIPT = dummy_add_transcript()
+ADD_TRANSCRIPT_PAYLOAD = json_dumps(ADD_TRANSCRIPT)
+AUDIO_ADDED_TEMPLATE = b'{"message":"AudioAdded","seq_no":%d}'
+
+
+def encode_response(response):
+    """
+    Returns the JSON payload for a response, reusing the encoded transcripts
+    and filling in the AudioAdded template rather than encoding them.
+    """
+    if response is ADD_PARTIAL_TRANSCRIPT:
+        return ADD_PARTIAL_TRANSCRIPT_PAYLOAD
+    if response is ADD_TRANSCRIPT:
+        return ADD_TRANSCRIPT_PAYLOAD
+    if response["message"] == "AudioAdded":
+        return AUDIO_ADDED_TEMPLATE % response["seq_no"]
+    return json_dumps(response)
+
+
 async def mock_server_handler(websocket, logbook):
-    mock_server_handler.next_audio_seq_no = 1
+    # Numbered per connection, as connections may overlap.
+    audio_seq_nos = itertools.count(1)
     address, _ = websocket.remote_address
     logbook.connection_request = websocket.request.headers
     logbook.path = websocket.request.path
@@ -189,14 +260,13 @@ async def mock_server_handler(websocket, logbook):
             responses.append(
                 {
                     "message": "AudioAdded",
-                    "seq_no": mock_server_handler.next_audio_seq_no,
+                    "seq_no": next(audio_seq_nos),
                 }
             )
-            mock_server_handler.next_audio_seq_no += 1
 
             # Answer immediately with a partial and a final.
-            responses.append(dummy_add_partial_transcript())
-            responses.append(dummy_add_transcript())
+            responses.append(ADD_PARTIAL_TRANSCRIPT)
+            responses.append(ADD_TRANSCRIPT)
         else:
             msg_name = message.get("message")
             if not msg_name:
@@ -223,12 +293,6 @@ async def mock_server_handler(websocket, logbook):
 
         return responses
 
-    def is_str(data_in):
-        return isinstance(data_in, str)
-
-    def build_payload(data_in):
-        return data_in.encode("utf-8") if is_str(data_in) else data_in
-
     try:
         async for data in websocket:
             logging.debug("%s %s", address, "incoming message")
@@ -236,18 +300,17 @@ async def mock_server_handler(websocket, logbook):
             if is_binary:
                 msg = data
             else:
-                msg = json.loads(data)
-            logbook.messages_received.append(msg)
+                msg = json_loads(data)
+            logbook.record_received(msg)
             for response in get_responses(msg, is_binary=is_binary):
-                logbook.messages_sent.append(response)
-                payload = build_payload(json.dumps(response).encode("utf-8"))
-                await websocket.send(payload)
+                logbook.record_sent(response)
+                await websocket.send(encode_response(response))
 
     except websockets.ConnectionClosedOK:  # pylint: disable=no-member
         logging.info("%s %s", address, "closed with close code")
     except websockets.ConnectionClosedError:  # pylint: disable=no-member
         logging.info("%s %s", address, "closed brutally")
-
-    # Connection closed
-    logging.info("%s %s", address, "closed")
-    logbook.clients_disconnected_count += 1
+    finally:
+        # Connection closed, including after an unexpected message.
+        logging.info("%s %s", address, "closed")
+        logbook.record_disconnect()
@@ -7,6 +7,17 @@ from speechmatics import adapters
 from tests.utils import path_to_test_resource
 
 
+@pytest.fixture(scope="session")
+def convert_to_txt_resources():
+    """Returns the contents of every convert_to_txt test resource by name."""
+    resources = {}
+    with os.scandir(path_to_test_resource("convert_to_txt")) as entries:
+        for entry in entries:
+            with open(entry.path, "r", encoding="utf-8") as file:
+                resources[entry.name] = file.read()
+    return resources
+
+
 @pytest.mark.parametrize(
     "json_name, txt_name, language_pack_info, speaker_labels",
     [
@@ -41,19 +52,15 @@ from tests.utils import path_to_test_resource
     ],
 )
 def test_convert_to_txt(
+    convert_to_txt_resources: dict,
     json_name: str,
     txt_name: str,
     language_pack_info: dict,
     speaker_labels: bool,
 ):
-    json_file_path = path_to_test_resource(os.path.join("convert_to_txt", json_name))
-    txt_file_path = path_to_test_resource(os.path.join("convert_to_txt", txt_name))
-
-    with open(json_file_path, "r", encoding="utf-8") as json_fh:
-        data = json.load(json_fh)
-
-    with open(txt_file_path, "r", encoding="utf-8") as txt_fh:
-        txt = txt_fh.read()
+    # The JSON is parsed for each case, so no case sees another's changes.
+    data = json.loads(convert_to_txt_resources[json_name])
+    txt = convert_to_txt_resources[txt_name]
 
     assert (
         adapters.convert_to_txt(
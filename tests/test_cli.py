@@ -7,6 +7,7 @@ import pytest
 import toml
 
 from speechmatics import cli
+from speechmatics import config
 from speechmatics import cli_parser
 from speechmatics.constants import (
     BATCH_SELF_SERVICE_URL,
@@ -827,6 +828,19 @@ def test_config_set_and_remove_toml(args):
             assert key not in cli_config[profile]
 
 
+def test_read_config_from_home_rereads_changed_file(tmp_path, monkeypatch):
+    config_path = tmp_path / "config"
+    monkeypatch.setattr(config, "CONFIG_PATH", config_path)
+    assert config.read_config_from_home() is None
+
+    config_path.write_text('[default]\nauth_token = "first"\n')
+    assert config.read_config_from_home() == {"auth_token": "first"}
+    assert config.read_config_from_home() == {"auth_token": "first"}
+
+    config_path.write_text('[default]\nauth_token = "second-token"\n')
+    assert config.read_config_from_home() == {"auth_token": "second-token"}
+
+
 def test_default_urls_connection_config():
     rt_args = {"mode": "rt"}
     settings = cli.get_connection_settings(rt_args, lang="es")
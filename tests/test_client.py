@@ -1,10 +1,14 @@
 import asyncio
 import copy
 import contextlib
+import hashlib
 import io
 import json
+import logging
+import sys
 from collections import Counter
-from unittest.mock import patch, MagicMock
+from unittest.mock import ANY, patch, MagicMock
+from types import SimpleNamespace
 from typing import Any
 
 import pytest
@@ -13,8 +17,10 @@ from pytest_httpx import HTTPXMock
 import websockets
 from speechmatics import client
 from speechmatics.batch_client import BatchClient
-from speechmatics.exceptions import ForceEndSession
+from speechmatics.exceptions import ForceEndSession, TranscriptionError
+from speechmatics.helpers import del_none, json_dumps
 from speechmatics.models import (
+    AudioSettings,
     ConnectionSettings,
     ServerMessageType,
     ClientMessageType,
@@ -31,7 +37,26 @@ def test_json_utf8():
     def example():
         return {"foo": True}
 
-    assert example() == '{"foo": true}'
+    assert json.loads(example()) == {"foo": True}
+    assert isinstance(example(), bytes)
+
+
+def test_del_none():
+    dictionary = {"a": None, "b": {"c": None, "d": {"e": None, "f": 1}}, "g": [None]}
+    assert del_none(dictionary) is dictionary
+    assert dictionary == {"b": {"d": {"f": 1}}, "g": [None]}
+
+
+@pytest.mark.parametrize("data", ['{"foo": [1, 2.5]}', b'{"foo": [1, 2.5]}'])
+def test_json_loads(data):
+    assert client.json_loads(data) == {"foo": [1, 2.5]}
+
+
+def test_json_dumps():
+    encoded = json_dumps({"language": "de", "vocab": ["Straße"]})
+    assert isinstance(encoded, str)
+    assert "Straße" in encoded
+    assert json.loads(encoded) == {"language": "de", "vocab": ["Straße"]}
 
 
 async def get_chunks(stream, chunks):
@@ -77,6 +102,56 @@ async def test_read_in_chunks():
         await gen.__anext__()
 
 
+@pytest.mark.asyncio
+async def test_read_in_chunks_buffer_pool():
+    pool = client.BufferPool(2, 2)
+    gen = client.read_in_chunks(io.BytesIO(bytes(range(5))), 2, buffer_pool=pool)
+
+    first = await gen.__anext__()
+    assert isinstance(first, memoryview)
+    assert first == b"\x00\x01"
+    assert await gen.__anext__() == b"\x02\x03"
+    # The third chunk reuses the first buffer.
+    assert await gen.__anext__() == b"\x04"
+    assert first[:1] == b"\x04"
+    with pytest.raises(StopAsyncIteration):
+        await gen.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_read_in_chunks_read_ahead():
+    data = bytes(range(7))
+    pool = client.BufferPool(4, 2)
+    chunks = [
+        bytes(chunk)
+        async for chunk in client.read_in_chunks(
+            io.BytesIO(data), 2, buffer_pool=pool, read_ahead=2
+        )
+    ]
+    assert b"".join(chunks) == data
+
+    with pytest.raises(ValueError):
+        async for _ in client.read_in_chunks(
+            io.BytesIO(data), 2, buffer_pool=client.BufferPool(3, 2), read_ahead=2
+        ):
+            pass
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("wss://host/v2", "wss://host/v2/en?sm-sdk=python-1.0"),
+        ("wss://host/v2/", "wss://host/v2/en?sm-sdk=python-1.0"),
+        ("wss://host/v2/en", "wss://host/v2/en?sm-sdk=python-1.0"),
+        ("wss://host/v2?foo=bar", "wss://host/v2/en?foo=bar&sm-sdk=python-1.0"),
+        ("wss://host/v2?sm-sdk=old", "wss://host/v2/en?sm-sdk=python-1.0"),
+    ],
+)
+def test_build_connection_url(url, expected):
+    # pylint: disable=protected-access
+    assert client._build_connection_url(url, "en", "sm-sdk=python-1.0") == expected
+
+
 def test_handlers_called(mock_server, mocker):
     ws_client, transcription_config, audio_settings = default_ws_client_setup(
         mock_server.url
@@ -107,6 +182,43 @@ def test_handlers_called(mock_server, mocker):
     assert all_handler.call_count == len(mock_server.messages_sent)
 
 
+def test_handlers_appended_directly_are_called(mock_server, mocker):
+    ws_client, transcription_config, audio_settings = default_ws_client_setup(
+        mock_server.url
+    )
+    handler = mocker.MagicMock()
+    middleware = mocker.MagicMock()
+    ws_client.event_handlers[ServerMessageType.EndOfTranscript].append(handler)
+    ws_client.middlewares[ClientMessageType.EndOfStream].append(middleware)
+
+    with open(path_to_test_resource("ch.wav"), "rb") as audio_stream:
+        ws_client.run_synchronously(audio_stream, transcription_config, audio_settings)
+    mock_server.wait_for_clean_disconnects()
+
+    handler.assert_called_once()
+    middleware.assert_called_once()
+
+
+def test_run_many(mock_server, mocker):
+    ws_client, transcription_config, audio_settings = default_ws_client_setup(
+        mock_server.url
+    )
+    end_of_transcript_handler = mocker.MagicMock()
+    ws_client.add_event_handler(
+        ServerMessageType.EndOfTranscript, end_of_transcript_handler
+    )
+
+    with open(path_to_test_resource("ch.wav"), "rb") as first, open(
+        path_to_test_resource("ch.wav"), "rb"
+    ) as second:
+        asyncio.run(
+            ws_client.run_many([first, second], transcription_config, audio_settings)
+        )
+    mock_server.wait_for_clean_disconnects()
+
+    assert end_of_transcript_handler.call_count == 2
+
+
 def test_middlewares_called(mock_server, mocker):
     ws_client, transcription_config, audio_settings = default_ws_client_setup(
         mock_server.url
@@ -156,6 +268,29 @@ def test_middlewares_called(mock_server, mocker):
     assert all_handler.call_count == len(mock_server.messages_received)
 
 
+def test_add_audio_middleware_receives_bytes(mock_server):
+    ws_client, transcription_config, audio_settings = default_ws_client_setup(
+        mock_server.url
+    )
+
+    # Audio is read into reused buffers, so middlewares must get their own
+    # copy of each chunk to keep it.
+    chunks = []
+    ws_client.add_middleware(
+        ClientMessageType.AddAudio, lambda chunk, is_binary: chunks.append(chunk)
+    )
+
+    with open(path_to_test_resource("ch.wav"), "rb") as audio_stream:
+        ws_client.run_synchronously(audio_stream, transcription_config, audio_settings)
+        audio_stream.seek(0)
+        audio = audio_stream.read()
+    mock_server.wait_for_clean_disconnects()
+
+    assert all(isinstance(chunk, bytes) for chunk in chunks)
+    assert b"".join(chunks) == audio
+    assert chunks == mock_server.find_add_audio_messages()
+
+
 def test_force_end_session_from_event_handler(mock_server):
     ws_client, transcription_config, audio_settings = default_ws_client_setup(
         mock_server.url
@@ -223,11 +358,47 @@ async def test_send_message(mock_server, message_type: str, message_data: Any):
         additional_headers=None,
     ) as ws_client.websocket:
         await ws_client.send_message(message_type, message_data)
+    mock_server.wait_for_clean_disconnects()
     assert message_type in [
         msg_types["message"] for msg_types in mock_server.messages_received
     ]
 
 
+def test_event_handlers_get_their_own_message():
+    ws_client = client.WebsocketClient(ConnectionSettings(url="fake url"))
+    received = []
+
+    def mutating_handler(msg):
+        received.append(msg["results"].pop())
+
+    ws_client.add_event_handler(ServerMessageType.AddTranscript, mutating_handler)
+    ws_client.add_event_handler(ServerMessageType.AddTranscript, mutating_handler)
+    ws_client._consumer('{"message": "AddTranscript", "results": [1]}')
+
+    assert received == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_consumer_skips_parsing_unneeded_messages(mocker):
+    # pylint: disable=protected-access
+    ws_client = client.WebsocketClient(ConnectionSettings(url="fake url"))
+    await ws_client._init_synchronization_primitives()
+    json_loads = mocker.patch("speechmatics.client.json_loads", wraps=json.loads)
+
+    ws_client._audio_chunks_in_flight = 1
+    ws_client._consumer(b'{"message": "AudioAdded", "seq_no": 1}')
+    ws_client._consumer(b'{"message":"Info","type":"recognition_quality"}')
+    assert ws_client._audio_chunks_in_flight == 0
+    json_loads.assert_not_called()
+
+    handler = MagicMock()
+    ws_client.add_event_handler(ServerMessageType.AudioAdded, handler)
+    ws_client._audio_chunks_in_flight = 1
+    ws_client._consumer(b'{"message": "AudioAdded", "seq_no": 2}')
+    handler.assert_called_once_with({"message": "AudioAdded", "seq_no": 2})
+    assert ws_client._audio_chunks_in_flight == 0
+
+
 @pytest.mark.parametrize(
     "client_message_type, expect_received_count, expect_sent_count",
     [
@@ -353,6 +524,40 @@ def test_helpful_error_message_received_on_connection_reset_error():
                 assert exc is not None
 
 
+@pytest.mark.skipif(sys.version_info < (3, 11), reason="requires asyncio.TaskGroup")
+def test_run_tasks_in_group_logs_further_errors(caplog):
+    ws_client, _, audio_settings = default_ws_client_setup("wss://localhost:1")
+
+    async def consumer_handler():
+        raise TranscriptionError("first")
+
+    async def producer_handler(*_):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            raise RuntimeError("second")  # pylint: disable=raise-missing-from
+
+    # pylint: disable=protected-access
+    ws_client._consumer_handler = consumer_handler
+    ws_client._producer_handler = producer_handler
+
+    with pytest.raises(TranscriptionError, match="first"):
+        asyncio.run(ws_client._run_tasks_in_group(None, audio_settings))
+
+    assert "RuntimeError('second')" in caplog.text
+
+
+def test_consumer_logs_messages_as_text(caplog):
+    caplog.set_level(logging.DEBUG, logger=client.LOGGER.name)
+    ws_client, _, _ = default_ws_client_setup("wss://localhost:1")
+    message = b'{"message": "Info", "type": "concurrent_session_usage"}'
+
+    # pylint: disable=protected-access
+    ws_client._consumer(message)
+
+    assert caplog.messages == [message.decode()]
+
+
 def test_extra_headers_are_passed_to_websocket_connect_correctly(mock_server):
     """Tests extra headers are passed correclty to the websocket onConnect call."""
     extra_headers = {"keyy": "value"}
@@ -378,61 +583,72 @@ def test_extra_headers_are_passed_to_websocket_connect_correctly(mock_server):
             assert (
                 connect_mock.mock_calls[0][2]["additional_headers"] == extra_headers
             ), f"Extra headers don't appear in the call list = {connect_mock.mock_calls}"
+            assert (
+                connect_mock.mock_calls[0][2]["write_limit"]
+                == ws_client.connection_settings.write_buffer_size
+            )
 
 
-@pytest.mark.asyncio
-async def test__buffer_semaphore():
-    """Test the WebsocketClient internal BoundedSemaphore."""
+def test_start_recognition_message_is_reused_until_config_changes(mocker):
     # pylint: disable=protected-access
-    buffer_size = 123
-    ws_client = client.WebsocketClient(
-        ConnectionSettings(url="fake url", message_buffer_size=buffer_size)
-    )
-    await ws_client._init_synchronization_primitives()
+    ws_client = client.WebsocketClient(ConnectionSettings(url="fake url"))
+    ws_client.transcription_config = TranscriptionConfig(language="en")
+    audio_settings = AudioSettings()
+    build = mocker.spy(ws_client, "_build_start_recognition")
 
-    async def ensure_release_raises():
-        with pytest.raises(ValueError) as ctx:
-            await ws_client._buffer_semaphore.release()
-        assert "BoundedSemaphore released too many times" in str(ctx.value)
+    first = ws_client._start_recognition(audio_settings)
+    assert ws_client._start_recognition(audio_settings) is first
+    assert build.call_count == 1
 
-    # The difference between a Semaphore and a BoundedSemaphore is that
-    # with the latter, a ValueError is raised if you call release()
-    # to increase the internal counter value above its initial value.
-    await ensure_release_raises()
+    ws_client.transcription_config.language = "de"
+    changed = ws_client._start_recognition(audio_settings)
+    assert json.loads(changed)["transcription_config"]["language"] == "de"
+    assert build.call_count == 2
 
-    async def acquire_x_times(times):
-        for _ in range(times):
-            await ws_client._buffer_semaphore.acquire()
+    ws_client.add_middleware(ClientMessageType.StartRecognition, MagicMock())
+    ws_client._start_recognition(audio_settings)
+    assert build.call_count == 3
 
-    await acquire_x_times(buffer_size)
 
-    for _ in range(buffer_size):
-        ws_client._buffer_semaphore.release()
+def test_end_of_stream_message():
+    # pylint: disable=protected-access
+    ws_client = client.WebsocketClient(ConnectionSettings(url="fake url"))
+    ws_client.seq_no = 42
+    expected = {"message": "EndOfStream", "last_seq_no": 42}
+    assert json.loads(ws_client._end_of_stream()) == expected
 
-    await ensure_release_raises()
+    def add_field(msg, _):
+        msg["extra"] = True
 
-    await acquire_x_times(buffer_size - 1)
-    assert not ws_client._buffer_semaphore.locked()
+    ws_client.add_middleware(ClientMessageType.EndOfStream, add_field)
+    assert json.loads(ws_client._end_of_stream()) == {**expected, "extra": True}
 
-    await acquire_x_times(1)
-    assert ws_client._buffer_semaphore.locked()
 
-    task = asyncio.create_task(acquire_x_times(1))
+@pytest.mark.asyncio
+async def test__on_audio_added_frees_buffer_space():
+    """Test the WebsocketClient internal count of unacknowledged audio."""
+    # pylint: disable=protected-access
+    ws_client = client.WebsocketClient(
+        ConnectionSettings(url="fake url", message_buffer_size=2)
+    )
+    await ws_client._init_synchronization_primitives()
+    assert ws_client._buffer_space_available.is_set()
 
-    # task should timeout because it's 'stuck' waiting for the
-    # semaphore to be released.
-    with pytest.raises(asyncio.TimeoutError):
-        await asyncio.wait_for(task, timeout=0.5)
+    # More AudioAdded acks than audio chunks sent is an error.
+    with pytest.raises(ValueError):
+        ws_client._on_audio_added({})
 
-    assert ws_client._buffer_semaphore.locked()
-    ws_client._buffer_semaphore.release()
-    assert not ws_client._buffer_semaphore.locked()
+    ws_client._audio_chunks_in_flight = 2
+    ws_client._buffer_space_available.clear()
+    ws_client._on_audio_added({})
+    assert ws_client._audio_chunks_in_flight == 1
+    assert ws_client._buffer_space_available.is_set()
 
 
 @pytest.mark.asyncio
-async def test__producer_happy_path(mocker):
+async def test__producer_handler_happy_path(mocker):
     """
-    Happy path _producer test where the client sends 8 audio chunks
+    Happy path _producer_handler test where the client sends 8 audio chunks
     and then stops.
     """
     # pylint: disable=protected-access,too-many-locals
@@ -442,6 +658,15 @@ async def test__producer_happy_path(mocker):
         ConnectionSettings(url="fake url", message_buffer_size=buffer_size)
     )
     await ws_client._init_synchronization_primitives()
+    ws_client._recognition_started.set()
+
+    msgs_states = []
+
+    async def record_sent_message(msg, text=False):
+        msgs_states.append((msg, deepcopy_state(ws_client)))
+        assert ws_client._buffer_space_available.is_set()
+
+    ws_client.websocket = SimpleNamespace(send=record_sent_message)
     original_state = deepcopy_state(ws_client)
 
     async_iter_mock = MagicMock()
@@ -450,11 +675,10 @@ async def test__producer_happy_path(mocker):
         "speechmatics.client.read_in_chunks", new=async_iter_mock
     )
 
-    msgs_states = []
-    async for msg in ws_client._producer("mock", 123):
-        msgs_states.append((msg, deepcopy_state(ws_client)))
-        assert not ws_client._buffer_semaphore.locked()
-    mock_read_in_chunks.assert_called_once_with("mock", 123)
+    await ws_client._producer_handler("mock", 123)
+    mock_read_in_chunks.assert_called_once_with(
+        "mock", 123, buffer_pool=ANY, read_ahead=ANY
+    )
 
     exp_iters = no_chunks_to_send + 1
     exp_final_seq_no = no_chunks_to_send
@@ -465,24 +689,42 @@ async def test__producer_happy_path(mocker):
         if index < exp_iters - 1:
             assert msg == index  # from range in mock_read_in_chunks
             exp_current_seq_no += 1
-            cmp_dicts(original_state, state, exp_diffs={"seq_no": exp_current_seq_no})
+            cmp_dicts(
+                original_state,
+                state,
+                exp_diffs={
+                    "seq_no": exp_current_seq_no,
+                    "_audio_chunks_in_flight": exp_current_seq_no,
+                },
+            )
         else:
-            assert msg == json.dumps(
-                {"message": "EndOfStream", "last_seq_no": exp_final_seq_no}
+            assert json.loads(msg) == {
+                "message": "EndOfStream",
+                "last_seq_no": exp_final_seq_no,
+            }
+            cmp_dicts(
+                original_state,
+                state,
+                exp_diffs={
+                    "seq_no": exp_final_seq_no,
+                    "_audio_chunks_in_flight": exp_final_seq_no,
+                },
             )
-            cmp_dicts(original_state, state, exp_diffs={"seq_no": exp_final_seq_no})
 
     assert exp_iters == len(msgs_states)
 
     cmp_dicts(
         original_state,
         deepcopy_state(ws_client),
-        exp_diffs={"seq_no": exp_final_seq_no},
+        exp_diffs={
+            "seq_no": exp_final_seq_no,
+            "_audio_chunks_in_flight": exp_final_seq_no,
+        },
     )
 
 
 @pytest.mark.asyncio
-async def test__producer_semaphore_pause_and_resume(mocker):
+async def test__producer_handler_semaphore_pause_and_resume(mocker):
     """
     Test simulating the client sending audio chunks to a server faster
     than it can reply to them with AudioAdded acks causing the client
@@ -496,6 +738,7 @@ async def test__producer_semaphore_pause_and_resume(mocker):
         ConnectionSettings(url="fake url", message_buffer_size=buffer_size)
     )
     await ws_client._init_synchronization_primitives()
+    ws_client._recognition_started.set()
 
     async_iter_mock = MagicMock()
     async_iter_mock.return_value.__aiter__.return_value = range(no_chunks_to_send)
@@ -505,22 +748,29 @@ async def test__producer_semaphore_pause_and_resume(mocker):
 
     msgs = []
 
+    async def record_sent_message(msg, text=False):
+        msgs.append(msg)
+
+    ws_client.websocket = SimpleNamespace(send=record_sent_message)
+
     async def iter_through__producer():
-        async for msg in ws_client._producer("mock", 123):
-            msgs.append(msg)
+        await ws_client._producer_handler("mock", 123)
 
-    async def release_semaphore():  # acting as the slow server
+    async def ack_audio():  # acting as the slow server
         times_when_buffer_full = 0
         while True:
             if len(msgs) == buffer_size:
                 times_when_buffer_full += 1
-            if times_when_buffer_full > 5 and ws_client._buffer_semaphore.locked():
-                ws_client._buffer_semaphore.release()
+            if (
+                times_when_buffer_full > 5
+                and not ws_client._buffer_space_available.is_set()
+            ):
+                ws_client._on_audio_added({})
                 break
             await asyncio.sleep(0.0001)
 
     task1 = asyncio.create_task(iter_through__producer())
-    task2 = asyncio.create_task(release_semaphore())
+    task2 = asyncio.create_task(ack_audio())
 
     done, pending = await asyncio.wait(
         [task1, task2], return_when=asyncio.FIRST_EXCEPTION, timeout=5
@@ -535,7 +785,7 @@ async def test__producer_semaphore_pause_and_resume(mocker):
 
 
 @pytest.mark.asyncio
-async def test__producer_semaphore_timeout(mocker):
+async def test__producer_handler_semaphore_timeout(mocker):
     """
     Test simulating the client continually sending audio chunks to
     a server that isn't responding with AudioAdded acks."""
@@ -551,6 +801,7 @@ async def test__producer_semaphore_timeout(mocker):
         )
     )
     await ws_client._init_synchronization_primitives()
+    ws_client._recognition_started.set()
 
     async_iter_mock = MagicMock()
     async_iter_mock.return_value.__aiter__.return_value = range(no_chunks_to_send)
@@ -560,9 +811,13 @@ async def test__producer_semaphore_timeout(mocker):
 
     msgs = []
 
+    async def record_sent_message(msg, text=False):
+        msgs.append(msg)
+
+    ws_client.websocket = SimpleNamespace(send=record_sent_message)
+
     async def ensure_timeout():
-        async for msg in ws_client._producer("mock", 123):
-            msgs.append(msg)
+        await ws_client._producer_handler("mock", 123)
 
     async def ensure_timeout_happens_in_time():
         await asyncio.sleep(quick_timeout + 1)
@@ -603,6 +858,79 @@ def test_language_pack_info_is_stored(mock_server):
     assert info["language_code"] == "en"
 
 
+@pytest.mark.asyncio
+async def test_get_temp_token(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(json={"key_value": "temp-key"})
+
+    # pylint: disable=protected-access
+    assert await client._get_temp_token("api-key") == "temp-key"
+
+    request = httpx_mock.get_request()
+    assert request.method == "POST"
+    assert request.url.path == "/v1/api_keys"
+    assert request.headers["Authorization"] == "Bearer api-key"
+
+    # The token is still valid so it is reused without another request.
+    assert await client._get_temp_token("api-key") == "temp-key"
+    assert len(httpx_mock.get_requests()) == 1
+
+
+def test_get_temp_token_closes_client(httpx_mock: HTTPXMock, monkeypatch):
+    httpx_mock.add_response(json={"key_value": "temp-key"})
+    httpx_mock.add_response(json={"key_value": "other-key"})
+    # pylint: disable=protected-access
+    mp_clients = []
+    new_mp_client = client._new_mp_client
+
+    def recording_new_mp_client():
+        mp_clients.append(new_mp_client())
+        return mp_clients[-1]
+
+    monkeypatch.setattr(client, "_new_mp_client", recording_new_mp_client)
+
+    # Each call runs on its own event loop, as with run_synchronously, and
+    # must not leave its client open once the loop has finished.
+    assert asyncio.run(client._get_temp_token("api-key")) == "temp-key"
+    assert asyncio.run(client._get_temp_token("other-api-key")) == "other-key"
+
+    assert len(mp_clients) == 2
+    assert all(mp_client.is_closed for mp_client in mp_clients)
+
+
+@pytest.mark.asyncio
+async def test_get_temp_token_cache_drops_old_tokens(
+    httpx_mock: HTTPXMock, monkeypatch
+):
+    # pylint: disable=protected-access
+    for index in range(client._TEMP_TOKEN_CACHE_SIZE + 2):
+        httpx_mock.add_response(json={"key_value": f"temp-key-{index}"})
+    now = 1000.0
+    monkeypatch.setattr(client.time, "monotonic", lambda: now)
+
+    assert await client._get_temp_token("api-key") == "temp-key-0"
+    # The API key itself is not kept.
+    assert "api-key" not in client._temp_tokens
+    assert all(isinstance(key, bytes) for key in client._temp_tokens)
+
+    # Expired tokens are dropped once another is fetched.
+    now += client._TEMP_TOKEN_TTL
+    assert await client._get_temp_token("other-api-key") == "temp-key-1"
+    assert len(client._temp_tokens) == 1
+
+    # The cache holds at most _TEMP_TOKEN_CACHE_SIZE tokens.
+    for index in range(2, client._TEMP_TOKEN_CACHE_SIZE + 2):
+        await client._get_temp_token(f"api-key-{index}")
+    assert len(client._temp_tokens) == client._TEMP_TOKEN_CACHE_SIZE
+    # The oldest token made way for the newest.
+    oldest = hashlib.sha256(b"other-api-key").digest()
+    assert oldest not in client._temp_tokens
+    newest = f"api-key-{client._TEMP_TOKEN_CACHE_SIZE + 1}"
+    assert await client._get_temp_token(newest) == newest.replace("api", "temp")
+
+    client.clear_temp_tokens()
+    assert not client._temp_tokens
+
+
 def test_batch_mock_jobs(httpx_mock: HTTPXMock):
     # submit job
     httpx_mock.add_response(content=b'{"id":"p8t3dcrign"}')
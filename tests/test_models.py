@@ -1,4 +1,5 @@
-from dataclasses import asdict
+import json
+from dataclasses import asdict, fields, replace
 
 from pytest import mark, param
 
@@ -37,6 +38,31 @@ def test_transcriptionconfig_positional_arg():
     assert config.language == "de"
 
 
+def test_transcriptionconfig_ignores_unknown_kwargs():
+    config = models.TranscriptionConfig(max_delay=2, not_a_field=True)
+    assert config.max_delay == 2
+    assert config.enable_partials is None
+    assert not hasattr(config, "not_a_field")
+
+
+def test_batchtranscriptionconfig_asdict_matches_dataclasses_asdict():
+    config = models.BatchTranscriptionConfig(
+        additional_vocab=[{"content": "gnocchi", "sounds_like": ["nyohki"]}],
+        punctuation_overrides={"permitted_marks": [".", ","], "sensitivity": None},
+        fetch_data=models.FetchData(url="https://example.com/audio.wav"),
+        speaker_diarization_config=models.BatchSpeakerDiarizationConfig(),
+        translation_config=models.BatchTranslationConfig(target_languages=["de"]),
+    )
+    want = asdict(
+        config,
+        dict_factory=lambda items: {k: v for (k, v) in items if v is not None},
+    )
+    got = config.asdict()
+    assert got == want
+    got["additional_vocab"][0]["sounds_like"].append("nokey")
+    assert config.additional_vocab[0]["sounds_like"] == ["nyohki"]
+
+
 def test_batchtranscriptionconfig_excludes_nones():
     config = models.BatchTranscriptionConfig()
     config_dict = config.asdict()
@@ -50,6 +76,17 @@ def test_batchtranscriptionconfig_json_simple():
     assert got == want
 
 
+def test_batchtranscriptionconfig_as_config_dict():
+    config = models.BatchTranscriptionConfig(
+        fetch_data=models.FetchData(url="https://example.com/audio.wav"),
+        notification_config=models.NotificationConfig(url="https://example.com"),
+    )
+    assert config.as_config_dict() == json.loads(config.as_config())
+    assert config.as_config_dict()["notification_config"] == [
+        {"url": "https://example.com", "method": "post"}
+    ]
+
+
 def test_translationconfig_default_values():
     config = models.RTTranslationConfig()
     assert {"target_languages": None, "enable_partials": False} == config.asdict()
@@ -220,3 +257,63 @@ def test_notification_config(params, want):
 def test_audio_events_config_config(params, want):
     audio_events_config = models.AudioEventsConfig(**params)
     assert audio_events_config.asdict() == want
+
+
+def test_connection_settings_creates_default_ssl_context_on_first_use(mocker):
+    create_default_context = mocker.patch("ssl.create_default_context")
+    settings = models.ConnectionSettings(url="wss://example.com")
+    create_default_context.assert_not_called()
+
+    assert settings.ssl_context is create_default_context.return_value
+    assert settings.ssl_context is create_default_context.return_value
+    create_default_context.assert_called_once_with()
+
+    settings.ssl_context = None
+    assert settings.ssl_context is None
+
+
+def test_connection_settings_dataclass_helpers(mocker):
+    create_default_context = mocker.patch("ssl.create_default_context")
+
+    # The field default stands for the default context, not a bare sentinel.
+    (field,) = [f for f in fields(models.ConnectionSettings) if f.name == "ssl_context"]
+    assert field.default is models.ConnectionSettings.ssl_context
+    assert repr(field.default) == "<default SSL context>"
+    assert models.ConnectionSettings(url="wss://example.com").ssl_context is (
+        create_default_context.return_value
+    )
+
+    settings = models.ConnectionSettings(url="wss://example.com", ssl_context=None)
+    assert asdict(settings)["ssl_context"] is None
+    assert replace(settings, url="wss://other.com").ssl_context is None
+
+    settings = models.ConnectionSettings(url="wss://example.com")
+    copied = replace(settings, url="wss://other.com")
+    assert copied.url == "wss://other.com"
+    assert copied.ssl_context is settings.ssl_context
+    # Once for each settings created with the default context.
+    assert create_default_context.call_count == 2
+
+
+@mark.parametrize(
+    "member, want",
+    [
+        (models.ClientMessageType.StartRecognition, "StartRecognition"),
+        (models.ServerMessageType.AddTranscript, "AddTranscript"),
+    ],
+)
+def test_message_types_format_as_their_values(member, want):
+    # The same on every supported Python version, with or without enum.StrEnum.
+    assert str(member) == want
+    assert f"{member}" == want
+    assert "{}".format(member) == want
+
+
+@mark.parametrize(
+    "member, want",
+    [(models.UsageMode.Batch, "batch"), (models.UsageMode.RealTime, "rt")],
+)
+def test_usage_mode_formats_as_its_value(member, want):
+    assert str(member) == want
+    assert f"{member}" == want
+    assert member == want
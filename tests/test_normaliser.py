@@ -1,6 +1,9 @@
+import unicodedata
+
 import pytest
 
-from asr_metrics.wer.normalizers import EnglishTextNormalizer
+from asr_metrics.wer.normalizers import BasicTextNormalizer, EnglishTextNormalizer
+from asr_metrics.wer.normalizers.basic import remove_symbols
 from asr_metrics.wer.normalizers.english import EnglishNumberNormalizer
 
 
@@ -111,3 +114,61 @@ def test_disfluencies_removal():
         std("ah, this is my grand plan to take over the world Dr. X!")
         == "this is my grand plan to take over the world doctor x"
     )
+
+
+# Strings covering diacritics and the manual mappings, symbols (S*),
+# punctuation (P*) and marks other than Mn, such as the Mc vowel sign in
+# Devanagari and the Me enclosing circle.
+PARITY_STRINGS = [
+    "Crème brûlée à la française",
+    "Œuvre, smørrebrød, Straße, Þórr & Łódź",
+    "50% off! Price: $9.99 (was £12) — €10 + ¥100 © ™ ½",
+    "“Quotes”, «guillemets» and ‘apostrophes’… ¿qué? ¡sí!",
+    "नमस्ते दुनिया",
+    "a\u20dd b\u0301 c\u0327 \u00e9\u0300",
+    "ＦＵＬＬＷＩＤＴＨ ① ﬁ",
+    "",
+]
+
+
+def per_character_remove_symbols(s):
+    return "".join(
+        " " if unicodedata.category(c)[0] in "MSP" else c
+        for c in unicodedata.normalize("NFKC", s)
+    )
+
+
+def per_character_remove_symbols_and_diacritics(normalizer, s, keep=""):
+    return "".join(
+        c
+        if c in keep
+        else normalizer.additional_diacritics[c]
+        if c in normalizer.additional_diacritics
+        else ""
+        if unicodedata.category(c) == "Mn"
+        else " "
+        if unicodedata.category(c)[0] in "MSP"
+        else c
+        for c in unicodedata.normalize("NFKD", s)
+    )
+
+
+@pytest.mark.parametrize("text", PARITY_STRINGS)
+def test_remove_symbols_matches_per_character_loop(text):
+    assert remove_symbols(text) == per_character_remove_symbols(text)
+
+
+@pytest.mark.parametrize("keep", ["", "'", "$%.", "\u0301"])
+@pytest.mark.parametrize("text", PARITY_STRINGS)
+def test_remove_symbols_and_diacritics_matches_per_character_loop(text, keep):
+    normalizer = BasicTextNormalizer(remove_diacritics=True)
+    expected = per_character_remove_symbols_and_diacritics(normalizer, text, keep)
+
+    assert normalizer.remove_symbols_and_diacritics(text, keep=keep) == expected
+    # Again, now that the translation table for `keep` has been filled in.
+    assert normalizer.remove_symbols_and_diacritics(text, keep=keep) == expected
+
+
+def test_basic_normalizer_removes_diacritics():
+    std = BasicTextNormalizer(remove_diacritics=True)
+    assert std("Crème brûlée, Straße & Łódź!") == "creme brulee strasse lodz "
@@ -0,0 +1,271 @@
+import argparse
+
+import pandas as pd
+import pytest
+
+from asr_metrics.wer.__main__ import (
+    TranscriptDiff,
+    get_wer_args,
+    main,
+    process_pair,
+    process_pairs,
+    read_dbl,
+    run_cer,
+    run_wer,
+)
+
+
+@pytest.mark.parametrize(
+    "ref, hyp, opcodes, errors",
+    [
+        (
+            "the cat sat on the mat",
+            "the cat sat on a mat",
+            [("equal", 0, 4, 0, 4), ("replace", 4, 5, 4, 5), ("equal", 5, 6, 5, 6)],
+            {"insertions": [], "deletions": [], "substitutions": ["the -> a"]},
+        ),
+        (
+            "the cat sat",
+            "the black cat sat down",
+            [
+                ("equal", 0, 1, 0, 1),
+                ("insert", 1, 1, 1, 2),
+                ("equal", 1, 3, 2, 4),
+                ("insert", 3, 3, 4, 5),
+            ],
+            {"insertions": ["black", "down"], "deletions": [], "substitutions": []},
+        ),
+        (
+            "the cat sat on the mat",
+            "cat sat mat",
+            [
+                ("delete", 0, 1, 0, 0),
+                ("equal", 1, 3, 0, 2),
+                ("delete", 3, 5, 2, 2),
+                ("equal", 5, 6, 2, 3),
+            ],
+            {"insertions": [], "deletions": ["the", "on the"], "substitutions": []},
+        ),
+        (
+            "",
+            "hello there",
+            [("insert", 0, 0, 0, 2)],
+            {"insertions": ["hello there"], "deletions": [], "substitutions": []},
+        ),
+        (
+            "hello there",
+            "",
+            [("delete", 0, 2, 0, 0)],
+            {"insertions": [], "deletions": ["hello there"], "substitutions": []},
+        ),
+        (
+            "same words here",
+            "same words here",
+            [("equal", 0, 3, 0, 3)],
+            {"insertions": [], "deletions": [], "substitutions": []},
+        ),
+        ("", "", [], {"insertions": [], "deletions": [], "substitutions": []}),
+    ],
+)
+def test_word_diff(ref, hyp, opcodes, errors):
+    differ = TranscriptDiff(ref.split(), hyp.split(), join_token=" ")
+
+    assert [tuple(opcode) for opcode in differ.get_opcodes()] == opcodes
+    assert differ.errors == errors
+
+
+@pytest.mark.parametrize(
+    "ref, hyp, opcodes, errors",
+    [
+        (
+            "kitten",
+            "sitting",
+            [
+                ("replace", 0, 1, 0, 1),
+                ("equal", 1, 4, 1, 4),
+                ("replace", 4, 5, 4, 5),
+                ("equal", 5, 6, 5, 6),
+                ("insert", 6, 6, 6, 7),
+            ],
+            {
+                "insertions": ["g"],
+                "deletions": [],
+                "substitutions": ["k -> s", "e -> i"],
+            },
+        ),
+        (
+            "a cat",
+            "a bat",
+            [("equal", 0, 2, 0, 2), ("replace", 2, 3, 2, 3), ("equal", 3, 5, 3, 5)],
+            {"insertions": [], "deletions": [], "substitutions": ["c -> b"]},
+        ),
+        (
+            "",
+            "ab",
+            [("insert", 0, 0, 0, 2)],
+            {"insertions": ["ab"], "deletions": [], "substitutions": []},
+        ),
+        (
+            "ab",
+            "",
+            [("delete", 0, 2, 0, 0)],
+            {"insertions": [], "deletions": ["ab"], "substitutions": []},
+        ),
+        (
+            "abc",
+            "abc",
+            [("equal", 0, 3, 0, 3)],
+            {"insertions": [], "deletions": [], "substitutions": []},
+        ),
+    ],
+)
+def test_character_diff(ref, hyp, opcodes, errors):
+    differ = TranscriptDiff(ref, hyp, join_token="")
+
+    assert [tuple(opcode) for opcode in differ.get_opcodes()] == opcodes
+    assert differ.errors == errors
+
+
+@pytest.mark.parametrize(
+    "ref, hyp",
+    [
+        ("the cat sat on the mat", "the cat sat on a mat"),
+        ("the cat sat", "the black cat sat down"),
+        ("the cat sat on the mat", "cat sat mat"),
+        ("same words here", "same words here"),
+    ],
+)
+def test_diff_agrees_with_stats(ref, hyp):
+    differ, stats = run_wer(ref, hyp)
+    assert sum(len(segment.split()) for segment in differ.errors["insertions"]) == (
+        stats["insertions"]
+    )
+    assert sum(len(segment.split()) for segment in differ.errors["deletions"]) == (
+        stats["deletions"]
+    )
+    assert len(differ.errors["substitutions"]) == stats["substitutions"]
+
+    differ, stats = run_cer(ref, hyp)
+    assert sum(map(len, differ.errors["insertions"])) == stats["insertions"]
+    assert sum(map(len, differ.errors["deletions"])) == stats["deletions"]
+
+
+def test_no_diff_unless_asked():
+    differ, stats = run_wer("the cat sat", "the cat sat", diff=False)
+    assert differ is None
+    assert stats["wer"] == 0
+
+    differ, stats = run_cer("abc", "abd", diff=False)
+    assert differ is None
+    assert stats["cer"] == pytest.approx(1 / 3)
+
+
+@pytest.fixture
+def dbl_pairs(tmp_path):
+    """Writes reference and hypothesis DBL files listing three pairs of
+    transcripts, the last of which has an empty reference.
+
+    Returns:
+        The paths of the reference and hypothesis DBL files.
+    """
+    transcripts = [
+        ("The cat sat on the mat.", "the cat sat on a mat"),
+        ("Hello there, how are you?", "hello how are you today"),
+        ("", "nothing to compare against"),
+    ]
+    ref_paths, hyp_paths = [], []
+    for index, (ref, hyp) in enumerate(transcripts):
+        ref_path = tmp_path / f"ref{index}.txt"
+        hyp_path = tmp_path / f"hyp{index}.txt"
+        ref_path.write_text(ref, encoding="utf-8")
+        hyp_path.write_text(hyp, encoding="utf-8")
+        ref_paths.append(str(ref_path))
+        hyp_paths.append(str(hyp_path))
+
+    ref_dbl = tmp_path / "ref.dbl"
+    hyp_dbl = tmp_path / "hyp.dbl"
+    ref_dbl.write_text("\n".join(ref_paths), encoding="utf-8")
+    hyp_dbl.write_text("\n".join(hyp_paths), encoding="utf-8")
+    return str(ref_dbl), str(hyp_dbl)
+
+
+@pytest.mark.parametrize("cer", [False, True])
+def test_main_with_dbl(dbl_pairs, tmp_path, capsys, cer):
+    ref_dbl, hyp_dbl = dbl_pairs
+    csv_path = tmp_path / "results.csv"
+    options = ["--cer"] if cer else []
+    args = get_wer_args(argparse.ArgumentParser()).parse_args(
+        [*options, "--csv", str(csv_path), ref_dbl, hyp_dbl]
+    )
+
+    # More than one pair, so the pairs are scored in worker processes.
+    main(args)
+
+    assert "Reference or Hypothesis file empty. Skipping..." in capsys.readouterr().out
+    results = pd.read_csv(csv_path)
+    pairs = list(zip(read_dbl(ref_dbl), read_dbl(hyp_dbl)))
+    expected = [process_pair(ref, hyp, args) for ref, hyp in pairs]
+    assert expected[2] is None
+    assert list(results["file name"]) == [pairs[0][1], pairs[1][1]]
+
+    # The rows from the worker processes match scoring each pair in turn.
+    expected_stats = expected[:2]
+    columns = ["cer" if cer else "wer", "reference length"]
+    columns += ["substitutions", "deletions", "insertions"]
+    for row, stats in zip(results.to_dict("records"), expected_stats):
+        for column in columns:
+            assert row[column] == pytest.approx(stats[column])
+    for column in columns[1:]:
+        assert results[column].sum() == sum(stats[column] for stats in expected_stats)
+
+
+def test_process_pair_keeps_only_stats_unless_printing(dbl_pairs):
+    ref, hyp = next(zip(read_dbl(dbl_pairs[0]), read_dbl(dbl_pairs[1])))
+    parser = get_wer_args(argparse.ArgumentParser())
+
+    stats = process_pair(ref, hyp, parser.parse_args([ref, hyp]))
+    assert "diff" not in stats
+    assert "normalised reference" not in stats
+
+    args = parser.parse_args(["--diff", "--show-normalised", ref, hyp])
+    stats = process_pair(ref, hyp, args)
+    assert isinstance(stats["diff"], TranscriptDiff)
+    assert stats["normalised reference"] == "the cat sat on the mat"
+    assert stats["normalised hypothesis"] == "the cat sat on a mat"
+
+
+def test_process_pairs_reads_a_bounded_window(dbl_pairs):
+    pairs = list(zip(read_dbl(dbl_pairs[0]), read_dbl(dbl_pairs[1]))) * 3
+    args = get_wer_args(argparse.ArgumentParser()).parse_args(list(dbl_pairs))
+    read = []
+
+    def read_pairs():
+        for pair in pairs:
+            read.append(pair)
+            yield pair
+
+    results = process_pairs(read_pairs(), args, max_pending=2)
+    ref, hyp, stats = next(results)
+    assert (ref, hyp) == pairs[0]
+    assert stats == process_pair(ref, hyp, args)
+    # Only the pairs in the window have been read from the DBL so far.
+    assert len(read) == 2
+
+    # The rest of the results still come out in order.
+    rest = [(ref, hyp) for ref, hyp, _ in results]
+    assert rest == pairs[1:]
+    assert len(read) == len(pairs)
+
+
+def test_process_pairs_with_repeated_references(dbl_pairs):
+    # Several hypotheses against each reference, scored in worker processes.
+    refs = list(read_dbl(dbl_pairs[0]))[:2]
+    hyps = list(read_dbl(dbl_pairs[1]))
+    pairs = [(ref, hyp) for ref in refs for hyp in hyps]
+    args = get_wer_args(argparse.ArgumentParser()).parse_args(list(dbl_pairs))
+
+    results = list(process_pairs(pairs, args, max_pending=3))
+
+    assert [(ref, hyp) for ref, hyp, _ in results] == pairs
+    for ref, hyp, stats in results:
+        assert stats == process_pair(ref, hyp, args)